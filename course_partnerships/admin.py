@@ -1,48 +1,230 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.views.decorators.csrf import csrf_exempt
+
+from .assignment import refresh_partner_data
 from .models import *
+from .uploadhandlers import ImageUploadLimitHandler
+
+# Tables estimated to hold fewer rows are counted exactly
+EXACT_COUNT_THRESHOLD = 10000
+
+
+def estimate_row_count(model, using="default"):
+    """
+    Return the row count of a model's table estimated from database statistics, or None if unavailable.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "mysql":
+        sql = "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    elif connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)"
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using the table statistics instead of COUNT(*) for unfiltered changelists of large tables.
+
+    Filtered and searched changelists, and small tables, are still counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class ImageUploadLimitAdminMixin:
+    """
+    Reject oversized image uploads while the request body is being read.
+
+    The add and change views are exempted from the CSRF middleware so that the
+    upload handler can be installed before the body is parsed; the CSRF check
+    still runs in ModelAdmin.changeform_view.
+    """
+
+    @method_decorator(csrf_exempt)
+    def add_view(self, request, form_url="", extra_context=None):
+        request.upload_handlers.insert(0, ImageUploadLimitHandler(request))
+        return super().add_view(request, form_url, extra_context)
+
+    @method_decorator(csrf_exempt)
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        request.upload_handlers.insert(0, ImageUploadLimitHandler(request))
+        return super().change_view(request, object_id, form_url, extra_context)
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        rejected_uploads = getattr(request, "rejected_uploads", None)
+        if not rejected_uploads:
+            return form
+
+        class RejectedUploadsForm(form):
+            def clean(self):
+                cleaned_data = super().clean()
+                for field_name, messages in rejected_uploads.items():
+                    if field_name in self.fields:
+                        self.add_error(field_name, messages)
+                return cleaned_data
 
+        return RejectedUploadsForm
 
-class PartnerAdmin(admin.ModelAdmin):
+
+class PartnerAdmin(ImageUploadLimitAdminMixin, admin.ModelAdmin):
     list_display = ["name", "activate_school_admin"]
     search_fields = ["name"]
     prepopulated_fields = {"slug": ("name",)}
 
 
-class CenterAdmin(admin.ModelAdmin):
+class CenterAdmin(ImageUploadLimitAdminMixin, admin.ModelAdmin):
     list_display = ["name", "partner"]
+    list_select_related = ["partner"]
     search_fields = ["name"]
     prepopulated_fields = {"slug": ("name",)}
+    autocomplete_fields = ["partner"]
 
 
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ["name", "partner", "show_on_homepage"]
+    list_select_related = ["partner"]
     search_fields = ["name"]
-    raw_id_fields = ["partner"]
+    autocomplete_fields = ["partner"]
+
+
+class EnhancedCourseActionForm(ActionForm):
+    """
+    Action form carrying the partner, center or category to assign to the selected courses.
+    """
+
+    partner = forms.ModelChoiceField(queryset=Partner.objects.order_by("name"), required=False)
+    center = forms.ModelChoiceField(queryset=Center.objects.select_related("partner").order_by("name"), required=False)
+    category = forms.ModelChoiceField(queryset=Category.objects.order_by("name"), required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["center"].label_from_instance = lambda center: f"{center.partner} / {center}"
 
 
 class EnhancedCourseAdmin(admin.ModelAdmin):
-    list_display = ["course", "partner", "center", "category"]
+    """
+    Changelist of a table with one row per course on the platform.
+
+    Rows are listed without joining CourseOverview, with the copied display
+    name, and their partner, center and category loaded in the same query.
+    Filters list the small partner, center and category tables rather than the
+    values in use, which would scan this one, and the paginator estimates the
+    size of the unfiltered table instead of counting it.
+    """
+
+    list_display = ["course_id", "display_name", "partner", "center", "category"]
+    list_select_related = ["partner", "center", "category"]
+    list_filter = ["partner", "center", "category"]
     search_fields = ["course_id"]
-    raw_id_fields = ["course", "partner", "center", "category"]
+    raw_id_fields = ["course"]
+    autocomplete_fields = ["partner", "center", "category"]
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    action_form = EnhancedCourseActionForm
+    actions = ["assign_partner", "assign_center", "assign_category"]
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        url_name = getattr(request.resolver_match, "url_name", None) or ""
+        if url_name.endswith("_changelist"):
+            queryset = queryset.select_related("partner", "center", "category").only(
+                "id", "course_id", "display_name", "partner__name", "center__name", "category__name"
+            )
+        return queryset
+
+    def bulk_assign(self, request, queryset, **values):
+        """
+        Assign values to every selected course with a single UPDATE, then refresh the derived data.
+        """
+        queryset = queryset.order_by()
+        partner_ids = set(queryset.values_list("partner_id", flat=True).distinct())
+        updated = queryset.update(modified=timezone.now(), **values)
+        if updated:
+            partner_ids.add(values.get("partner_id"))
+            refresh_partner_data(partner_ids)
+        self.message_user(request, f"Updated {updated} courses.", messages.SUCCESS)
+
+    def get_action_choice(self, request, name):
+        """
+        Return the partner, center or category chosen in the action form, or None with an error message.
+        """
+        try:
+            choice = self.action_form.base_fields[name].clean(request.POST.get(name))
+        except ValidationError:
+            choice = None
+        if choice is None:
+            self.message_user(request, f"Select a {name} to assign.", messages.ERROR)
+        return choice
+
+    @admin.action(description="Assign the selected partner to the selected courses")
+    def assign_partner(self, request, queryset):
+        partner = self.get_action_choice(request, "partner")
+        if partner is not None:
+            # Courses already assigned to the partner keep their center; the others lose the previous partner's
+            self.bulk_assign(request, queryset.exclude(partner_id=partner.id), partner_id=partner.id, center_id=None)
+
+    @admin.action(description="Assign the selected center, and its partner, to the selected courses")
+    def assign_center(self, request, queryset):
+        center = self.get_action_choice(request, "center")
+        if center is not None:
+            self.bulk_assign(request, queryset, partner_id=center.partner_id, center_id=center.id)
+
+    @admin.action(description="Assign the selected category to the selected courses")
+    def assign_category(self, request, queryset):
+        category = self.get_action_choice(request, "category")
+        if category is not None:
+            self.bulk_assign(request, queryset, category_id=category.id)
 
 
 class PartnerOrganizationMappingAdmin(admin.ModelAdmin):
     list_display = ("partner", "organization", "display_name", "show_in_mobile_app")
-    list_filter = ("show_in_mobile_app", "partner", "organization")
+    list_select_related = ("partner", "organization")
+    list_filter = (
+        "show_in_mobile_app",
+        ("partner", admin.RelatedOnlyFieldListFilter),
+        ("organization", admin.RelatedOnlyFieldListFilter),
+    )
     search_fields = (
         "partner__name",
         "organization__name",
         "organization__short_name",
         "display_name",
     )
+    autocomplete_fields = ("partner",)
+    raw_id_fields = ("organization",)
+    show_full_result_count = False
 
 
-class CourseCreatorAdmin(admin.ModelAdmin):
+class CourseCreatorAdmin(ImageUploadLimitAdminMixin, admin.ModelAdmin):
     list_display = ("name", "partner", "title", "experience")
-    list_filter = ("partner",)
+    list_select_related = ("partner",)
+    list_filter = (("partner", admin.RelatedOnlyFieldListFilter),)
     search_fields = ("name", "title", "partner__name")
-    raw_id_fields = ("partner",)
+    autocomplete_fields = ("partner",)
     readonly_fields = ("created", "modified")
+    show_full_result_count = False
     fieldsets = (
         (
             "Basic Information",
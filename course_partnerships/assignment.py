@@ -0,0 +1,100 @@
+"""
+Set-based partner assignment for EnhancedCourse
+"""
+
+from django.utils import timezone
+from organizations.models import OrganizationCourse
+
+from .cache import bump_facet_index_version, bump_partner_version
+from .mappings import organization_partners
+from .models import EnhancedCourse, PartnerCategoryCount
+from .snapshots import homepage_catalog
+
+
+def resolve_partner_ids(course_ids):
+    """
+    Return {course_id: partner_id} for the given courses whose organization is mapped to a partner.
+
+    Course ids are returned as strings. A course linked to several organizations
+    gets the partner of its oldest mapped organization link.
+    """
+    partners = organization_partners.get_partners()
+    resolved = {}
+    org_courses = (
+        OrganizationCourse.objects.filter(course_id__in=[str(course_id) for course_id in course_ids])
+        .order_by("id")
+        .values_list("course_id", "organization_id")
+    )
+    for course_id, organization_id in org_courses:
+        partner_id = partners.get(organization_id)
+        if partner_id:
+            resolved.setdefault(str(course_id), partner_id)
+    return resolved
+
+
+def assign_partners(courses, only_partner_id=None, dry_run=False):
+    """
+    Assign mapped partners to the given EnhancedCourse queryset with a single bulk update.
+
+    Returns the list of updated EnhancedCourse instances, carrying only their id,
+    course_id and new partner_id.
+    """
+    rows = list(courses.values_list("id", "course_id", "partner_id"))
+    updated, affected_partner_ids = assign_partner_rows(rows, only_partner_id=only_partner_id, dry_run=dry_run)
+    if not dry_run:
+        refresh_partner_data(affected_partner_ids)
+    return updated
+
+
+def assign_partner_rows(rows, only_partner_id=None, dry_run=False):
+    """
+    Assign mapped partners to EnhancedCourse rows given as (id, course_id, partner_id) tuples.
+
+    Rows whose mapped partner differs from their current one are updated with a
+    single bulk update, unless dry_run is set, and lose their center, which
+    belonged to the previous partner. When only_partner_id is given, only rows
+    mapped to that partner are updated.
+
+    Data derived from EnhancedCourse is not refreshed; the ids of the partners
+    that need it are returned along with the updated instances.
+    """
+    partner_ids = resolve_partner_ids(course_id for _, course_id, _ in rows)
+
+    now = timezone.now()
+    updated = []
+    affected_partner_ids = set()
+    for pk, course_id, current_partner_id in rows:
+        partner_id = partner_ids.get(str(course_id))
+        if not partner_id or partner_id == current_partner_id:
+            continue
+        if only_partner_id and partner_id != only_partner_id:
+            continue
+        updated.append(EnhancedCourse(id=pk, course_id=course_id, partner_id=partner_id, center_id=None, modified=now))
+        affected_partner_ids.update((partner_id, current_partner_id))
+
+    if updated and not dry_run:
+        EnhancedCourse.objects.bulk_update(updated, ["partner", "center", "modified"])
+    return updated, affected_partner_ids
+
+
+def refresh_partner_data(partner_ids):
+    """
+    Bring the data derived from EnhancedCourse up to date after a bulk change.
+
+    Bulk updates do not send model signals, so anything kept up to date by the
+    EnhancedCourse signal handlers has to be refreshed here instead.
+
+    partner_ids holds the previous and new partners of the changed courses, with
+    None standing for courses without one; nothing is refreshed when it is empty.
+    The facet index and the homepage catalog cover every course, so they are
+    refreshed even when none of the changed courses has a partner.
+    """
+    partner_ids = set(partner_ids)
+    if not partner_ids:
+        return
+    bump_facet_index_version()
+    homepage_catalog.invalidate()
+    partner_ids = {partner_id for partner_id in partner_ids if partner_id}
+    if partner_ids:
+        PartnerCategoryCount.rebuild(partner_ids)
+        bump_partner_version(*partner_ids)
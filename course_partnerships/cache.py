@@ -0,0 +1,149 @@
+"""
+Cache helpers for course_partnerships
+
+Derived data is cached under version numbers kept in the shared cache.
+Anything that changes the source data bumps the version, which orphans every
+entry stored under the previous one, so nothing has to be deleted explicitly.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+PARTNER_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+PARTNER_VERSION_KEY = "course_partnerships.partner.{partner_id}.version"
+PARTNER_PAGE_KEY = "course_partnerships.partner.{partner_id}.page.v{version}"
+ORGANIZATION_PARTNERS_VERSION_KEY = "course_partnerships.organization_partners.version"
+SLUGS_VERSION_KEY = "course_partnerships.slugs.version"
+SNAPSHOT_VERSION_KEY = "course_partnerships.snapshot.{name}.version"
+FACET_INDEX_VERSION_KEY = "course_partnerships.facet_index.version"
+IMAGE_DERIVATIVES_KEY = "course_partnerships.image_derivatives.{digest}"
+
+
+def _get_version(key):
+    """
+    Return the version stored under key, initialising it if needed.
+
+    Versions start from the current timestamp so that a version key evicted
+    from the cache never comes back with a number that was used before.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time()), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key):
+    """
+    Increment the version stored under key and return the new version.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time())
+        cache.set(key, version, None)
+        return version
+
+
+def get_page_cache_timeout():
+    """
+    Return the lifetime, in seconds, of cached school page data.
+    """
+    return getattr(settings, "COURSE_PARTNERSHIPS_PAGE_CACHE_TIMEOUT", PARTNER_PAGE_CACHE_TIMEOUT)
+
+
+def get_partner_version(partner_id):
+    """
+    Return the current cache version of a partner.
+    """
+    return _get_version(PARTNER_VERSION_KEY.format(partner_id=partner_id))
+
+
+def bump_partner_version(*partner_ids):
+    """
+    Invalidate every cached entry of the given partners.
+    """
+    for partner_id in set(partner_ids):
+        if partner_id:
+            _bump_version(PARTNER_VERSION_KEY.format(partner_id=partner_id))
+
+
+def get_partner_page_key(partner_id):
+    """
+    Return the cache key of the current page data of a partner.
+    """
+    return PARTNER_PAGE_KEY.format(partner_id=partner_id, version=get_partner_version(partner_id))
+
+
+def get_slugs_version():
+    """
+    Return the current version of the partner and center slugs.
+    """
+    return _get_version(SLUGS_VERSION_KEY)
+
+
+def bump_slugs_version():
+    """
+    Tell every process that its slug lookup cache is stale.
+    """
+    _bump_version(SLUGS_VERSION_KEY)
+
+
+def get_organization_partners_version():
+    """
+    Return the current version of the organization to partner mappings.
+    """
+    return _get_version(ORGANIZATION_PARTNERS_VERSION_KEY)
+
+
+def bump_organization_partners_version():
+    """
+    Tell every process that its organization to partner map is stale.
+    """
+    _bump_version(ORGANIZATION_PARTNERS_VERSION_KEY)
+
+
+def get_snapshot_version(name):
+    """
+    Return the current version of a named snapshot.
+    """
+    return _get_version(SNAPSHOT_VERSION_KEY.format(name=name))
+
+
+def bump_snapshot_version(name):
+    """
+    Invalidate every cached variant of a named snapshot.
+    """
+    _bump_version(SNAPSHOT_VERSION_KEY.format(name=name))
+
+
+def get_facet_index_version():
+    """
+    Return the current version of the course facet index.
+    """
+    return _get_version(FACET_INDEX_VERSION_KEY)
+
+
+def bump_facet_index_version():
+    """
+    Tell every process that its course facet index is stale, and return the new version.
+    """
+    return _bump_version(FACET_INDEX_VERSION_KEY)
+
+
+def _get_image_derivatives_key(name):
+    return IMAGE_DERIVATIVES_KEY.format(digest=hashlib.md5(name.encode()).hexdigest())
+
+
+def get_cached_image_derivatives(name):
+    """
+    Return the cached set of (width, format) derivatives stored for the image stored as name, or None.
+    """
+    return cache.get(_get_image_derivatives_key(name))
+
+
+def set_cached_image_derivatives(name, variants, timeout):
+    cache.set(_get_image_derivatives_key(name), frozenset(variants), timeout)
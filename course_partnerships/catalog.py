@@ -0,0 +1,113 @@
+"""
+Faceted catalog queries over EnhancedCourse
+
+A catalog query filters courses by partner, centers, categories and course
+fields, and returns one page of matching courses together with the number of
+courses behind every center and category facet.
+
+All facet counts come from a single query grouped by (center, category).
+Counts follow the usual disjunctive faceting rule: the count of a center takes
+the selected categories into account but not the other selected centers, and
+vice versa, so that users can see what selecting another value would add.
+When only partner, center and category filters are used, the counts come from
+the in-process facet index instead, without any query.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count
+
+from .facets import facet_index
+from .models import EnhancedCourse
+from .pagination import DEFAULT_PAGE_SIZE
+
+
+class CatalogQuery:
+    """
+    Filter set over EnhancedCourse.
+
+    Args:
+        partner_id (int): Only courses of this partner, if given
+        center_ids (iterable): Only courses of one of these centers, if any
+        category_ids (iterable): Only courses of one of these categories, if any
+        start_after (datetime): Only courses starting at or after this date
+        start_before (datetime): Only courses starting before this date
+        language (str): Only courses in this language
+    """
+
+    def __init__(
+        self, partner_id=None, center_ids=(), category_ids=(), start_after=None, start_before=None, language=None
+    ):
+        self.partner_id = partner_id
+        self.center_ids = set(center_ids)
+        self.category_ids = set(category_ids)
+        self.start_after = start_after
+        self.start_before = start_before
+        self.language = language
+
+    def get_base_queryset(self):
+        """
+        Return the courses matching every filter except the center and category ones.
+        """
+        courses = EnhancedCourse.objects.all()
+        if self.partner_id is not None:
+            courses = courses.filter(partner_id=self.partner_id)
+        if self.start_after:
+            courses = courses.filter(EnhancedCourse.snapshot_q("start__gte", self.start_after))
+        if self.start_before:
+            courses = courses.filter(EnhancedCourse.snapshot_q("start__lt", self.start_before))
+        if self.language:
+            courses = courses.filter(EnhancedCourse.snapshot_q("language", self.language))
+        return courses
+
+    def get_queryset(self):
+        """
+        Return the courses matching every filter.
+        """
+        courses = self.get_base_queryset()
+        if self.center_ids:
+            courses = courses.filter(center_id__in=self.center_ids)
+        if self.category_ids:
+            courses = courses.filter(category_id__in=self.category_ids)
+        return courses
+
+    def get_facets(self):
+        """
+        Return the facet counts and the total number of matching courses.
+
+        Returns:
+            dict: {"centers": {center_id: count}, "categories": {category_id: count}, "count": int}
+        """
+        if not (self.start_after or self.start_before or self.language):
+            return facet_index.get_facets(self.partner_id, self.center_ids, self.category_ids)
+        rows = (
+            self.get_base_queryset()
+            .values_list("center_id", "category_id")
+            .annotate(course_count=Count("id"))
+            .order_by()
+        )
+        return self.count_facets(rows)
+
+    def count_facets(self, rows):
+        """
+        Compute the facet counts from (center_id, category_id, course_count) rows.
+        """
+        centers = defaultdict(int)
+        categories = defaultdict(int)
+        total = 0
+        for center_id, category_id, course_count in rows:
+            center_selected = not self.center_ids or center_id in self.center_ids
+            category_selected = not self.category_ids or category_id in self.category_ids
+            if center_id is not None and category_selected:
+                centers[center_id] += course_count
+            if category_id is not None and center_selected:
+                categories[category_id] += course_count
+            if center_selected and category_selected:
+                total += course_count
+        return {"centers": dict(centers), "categories": dict(categories), "count": total}
+
+    def get_page(self, cursor=None, page_size=DEFAULT_PAGE_SIZE, as_values=True):
+        """
+        Return one page of matching courses and the cursor of the next page.
+        """
+        return EnhancedCourse.paginate(self.get_queryset(), cursor=cursor, page_size=page_size, as_values=as_values)
@@ -0,0 +1,213 @@
+"""
+In-process facet index over EnhancedCourse
+
+Every partner, center and category maps to a bitmap of the EnhancedCourse row
+ids assigned to it, stored as a Python int with bit n set for row n. Unions,
+intersections and counts are then single big-integer operations, so facet
+questions are answered without SQL.
+
+A bitmap takes one bit per row id up to the highest id it contains, so each
+process holds about (1 + number of partners, centers and categories) times
+max(id) / 8 bytes: with ids up to a million, around 125 KB per partner,
+center or category whose courses include recent rows. The index also keeps,
+per partner, the centers and categories its courses use, so the facet counts
+of a partner only intersect those bitmaps, each in time proportional to their
+size.
+
+Each process builds the index lazily and checks a version number kept in the
+shared cache before using it. Course saves and deletes update the index of the
+process making them in place and bump the version, which makes the other
+processes rebuild theirs on their next use.
+"""
+
+import threading
+
+from .cache import bump_facet_index_version, get_facet_index_version
+from .models import EnhancedCourse
+
+FACETS = ("partner", "center", "category")
+
+
+def to_bitmap(ids):
+    """
+    Return the bitmap of the given non-negative integer ids.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for pk in ids:
+        buffer[pk >> 3] |= 1 << (pk & 7)
+    return int.from_bytes(buffer, "little")
+
+
+# Number of set bits of every byte value
+POPCOUNT_TABLE = bytes(bin(byte).count("1") for byte in range(256))
+
+
+def _popcount_bytes(bitmap):
+    return sum(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little").translate(POPCOUNT_TABLE))
+
+
+# Return the number of ids set in a bitmap; int.bit_count() needs Python 3.10
+popcount = getattr(int, "bit_count", None) or _popcount_bytes
+
+
+def iter_bitmap(bitmap):
+    """
+    Yield the ids set in a bitmap, in increasing order.
+    """
+    for index, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")):
+        while byte:
+            low = byte & -byte
+            yield index * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+class FacetIndex:
+    """
+    Process-local {facet: {value id: bitmap of EnhancedCourse ids}} index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._all = 0
+        self._bitmaps = {facet: {} for facet in FACETS}
+        self._partner_values = {}
+
+    def ensure_current(self):
+        """
+        Reload the index if another process changed the courses since it was built.
+        """
+        version = get_facet_index_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._all, self._bitmaps, self._partner_values = self.load()
+                    self._version = version
+
+    @staticmethod
+    def load():
+        """
+        Build the index from the database.
+
+        Returns the bitmap of every course, the bitmaps of every facet value and
+        {partner id: {facet: ids of the values used by its courses}}.
+        """
+        all_ids = []
+        ids = {facet: {} for facet in FACETS}
+        partner_values = {}
+        for row in EnhancedCourse.objects.values_list("id", "partner_id", "center_id", "category_id").iterator():
+            pk = row[0]
+            all_ids.append(pk)
+            for facet, value in zip(FACETS, row[1:]):
+                if value is not None:
+                    ids[facet].setdefault(value, []).append(pk)
+            FacetIndex._add_partner_values(partner_values, row[1:])
+        bitmaps = {facet: {value: to_bitmap(pks) for value, pks in values.items()} for facet, values in ids.items()}
+        return to_bitmap(all_ids), bitmaps, partner_values
+
+    @staticmethod
+    def _add_partner_values(partner_values, assignment):
+        partner_id, center_id, category_id = assignment
+        if partner_id is None:
+            return
+        values = partner_values.setdefault(partner_id, {"center": set(), "category": set()})
+        if center_id is not None:
+            values["center"].add(center_id)
+        if category_id is not None:
+            values["category"].add(category_id)
+
+    def update(self, pk, previous=None, current=None):
+        """
+        Move a course between facets once a change to it is committed.
+
+        `previous` and `current` are the (partner_id, center_id, category_id)
+        assignment of the course before and after the change, None for a
+        created or deleted course. The shared version is bumped in every case;
+        the local index is only patched when it was current up to this change,
+        and is rebuilt on its next use otherwise.
+        """
+        with self._lock:
+            known_version = self._version
+            version = bump_facet_index_version()
+            if known_version is None or version != known_version + 1:
+                return
+            bit = 1 << pk
+            if previous:
+                for facet, value in zip(FACETS, previous):
+                    if value in self._bitmaps[facet]:
+                        self._bitmaps[facet][value] &= ~bit
+            if current:
+                self._all |= bit
+                self._add_partner_values(self._partner_values, current)
+                for facet, value in zip(FACETS, current):
+                    if value is not None:
+                        self._bitmaps[facet][value] = self._bitmaps[facet].get(value, 0) | bit
+            else:
+                self._all &= ~bit
+            self._version = version
+
+    def _union(self, facet, value_ids):
+        bitmaps = self._bitmaps[facet]
+        bitmap = 0
+        for value_id in value_ids:
+            bitmap |= bitmaps.get(value_id, 0)
+        return bitmap
+
+    def get_bitmap(self, partner_id=None, center_ids=(), category_ids=()):
+        """
+        Return the bitmap of the courses of a partner in any of the given centers and categories.
+        """
+        self.ensure_current()
+        bitmap = self._all if partner_id is None else self._bitmaps["partner"].get(partner_id, 0)
+        if center_ids:
+            bitmap &= self._union("center", center_ids)
+        if category_ids:
+            bitmap &= self._union("category", category_ids)
+        return bitmap
+
+    def get_course_ids(self, partner_id=None, center_ids=(), category_ids=()):
+        """
+        Return the ids of the matching EnhancedCourse rows, in increasing order.
+        """
+        return list(iter_bitmap(self.get_bitmap(partner_id, center_ids, category_ids)))
+
+    def count(self, partner_id=None, center_ids=(), category_ids=()):
+        """
+        Return the number of matching courses.
+        """
+        return popcount(self.get_bitmap(partner_id, center_ids, category_ids))
+
+    def get_facets(self, partner_id=None, center_ids=(), category_ids=()):
+        """
+        Return the facet counts of a filter set, in the format of `CatalogQuery.get_facets`.
+
+        The count of a center ignores the other selected centers and the count
+        of a category the other selected categories. Only the centers and
+        categories used by the partner's courses are counted.
+        """
+        self.ensure_current()
+        if partner_id is None:
+            base = self._all
+            value_ids = {facet: self._bitmaps[facet].keys() for facet in ("center", "category")}
+        else:
+            base = self._bitmaps["partner"].get(partner_id, 0)
+            value_ids = self._partner_values.get(partner_id, {"center": (), "category": ()})
+        in_centers = base & self._union("center", center_ids) if center_ids else base
+        in_categories = base & self._union("category", category_ids) if category_ids else base
+
+        facets = {"count": popcount(in_centers & in_categories)}
+        for name, facet, selection in (("centers", "center", in_categories), ("categories", "category", in_centers)):
+            bitmaps = self._bitmaps[facet]
+            counts = {}
+            for value_id in tuple(value_ids[facet]):
+                count = popcount(bitmaps.get(value_id, 0) & selection)
+                if count:
+                    counts[value_id] = count
+            facets[name] = counts
+        return facets
+
+
+facet_index = FacetIndex()
@@ -0,0 +1,253 @@
+"""
+Responsive image derivatives
+
+Every uploaded logo, banner and profile picture gets resized and recompressed
+variants, one per configured width in the original format and in WebP. The
+variants are stored next to the original under a deterministic name, so
+generating them twice is a no-op.
+
+Derivatives are only advertised once they are stored. Which ones exist is
+checked against the storage on a cache miss and kept in the shared cache.
+
+Decoding and encoding never run in web workers: saved images are handed to a
+celery task, and the `generate_image_derivatives` command renders backfills in
+its own process pool. Images larger than the upload pixel limit of their field
+are not decoded at all.
+"""
+
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .cache import (
+    bump_partner_version,
+    bump_snapshot_version,
+    get_cached_image_derivatives,
+    set_cached_image_derivatives,
+)
+from .validators import get_image_upload_limits
+
+log = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = (240, 480, 960)
+DERIVATIVE_FORMATS = ("original", "webp")
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+# How long the derivatives found for an image are cached, shorter while some are missing
+DERIVATIVES_CACHE_TIMEOUT = 60 * 60 * 24
+MISSING_DERIVATIVES_CACHE_TIMEOUT = 60
+
+# Image fields getting derivatives, per course_partnerships model
+IMAGE_FIELDS = {
+    "Partner": ("logo", "banner"),
+    "Center": ("logo", "banner"),
+    "CourseCreator": ("profile_picture",),
+}
+# Snapshots embedding derivative URLs
+IMAGE_SNAPSHOTS = ("partner_directory", "homepage_catalog")
+
+
+def get_derivative_widths():
+    return tuple(getattr(settings, "COURSE_PARTNERSHIPS_IMAGE_DERIVATIVE_WIDTHS", DERIVATIVE_WIDTHS))
+
+
+def get_derivative_name(name, width, fmt):
+    """
+    Return the storage name of a derivative of the image stored as name.
+    """
+    dirname, basename = os.path.split(name)
+    stem, ext = os.path.splitext(basename)
+    ext = ".webp" if fmt == "webp" else ext.lower()
+    return os.path.join(dirname, "derivatives", f"{stem}_{width}w{ext}")
+
+
+def get_derivative_names(name):
+    """
+    Return {derivative name: (width, format)} for every derivative of the image stored as name.
+    """
+    return {
+        get_derivative_name(name, width, fmt): (width, fmt)
+        for fmt in DERIVATIVE_FORMATS
+        for width in get_derivative_widths()
+    }
+
+
+def get_stored_variants(field_file):
+    """
+    Return the set of (width, format) derivatives stored for an image.
+    """
+    variants = get_cached_image_derivatives(field_file.name)
+    if variants is None:
+        names = get_derivative_names(field_file.name)
+        variants = {variant for name, variant in names.items() if field_file.storage.exists(name)}
+        timeout = DERIVATIVES_CACHE_TIMEOUT if len(variants) == len(names) else MISSING_DERIVATIVES_CACHE_TIMEOUT
+        set_cached_image_derivatives(field_file.name, variants, timeout)
+    return variants
+
+
+def get_derivatives(field_file):
+    """
+    Return the stored derivatives of an image as a list of {"width", "format", "url"} dicts.
+
+    The format is "webp" or "original". Nothing is returned for an empty field,
+    and only the original is available until the derivatives are generated.
+    """
+    if not field_file:
+        return []
+    stored = get_stored_variants(field_file)
+    return [
+        {"width": width, "format": fmt, "url": field_file.storage.url(name)}
+        for name, (width, fmt) in get_derivative_names(field_file.name).items()
+        if (width, fmt) in stored
+    ]
+
+
+def get_srcset(field_file, fmt="original"):
+    """
+    Return a `srcset` attribute value listing the derivatives of an image in one format.
+    """
+    return ", ".join(
+        f"{derivative['url']} {derivative['width']}w"
+        for derivative in get_derivatives(field_file)
+        if derivative["format"] == fmt
+    )
+
+
+class ImageDerivativesMixin:
+    """
+    Model mixin giving templates access to the derivatives of image fields.
+    """
+
+    def get_image_derivatives(self, field_name):
+        return get_derivatives(getattr(self, field_name))
+
+    def get_image_srcset(self, field_name, fmt="original"):
+        return get_srcset(getattr(self, field_name), fmt)
+
+
+def _encode(image, fmt):
+    output = io.BytesIO()
+    if fmt == "WEBP":
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        image.save(output, "WEBP", quality=WEBP_QUALITY, method=6)
+    elif fmt == "JPEG":
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(output, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(output, fmt, optimize=True)
+    return output.getvalue()
+
+
+def get_max_pixels(field_file):
+    """
+    Return the largest number of pixels of an image field that gets decoded, its upload limit.
+    """
+    return get_image_upload_limits(field_file.field.name)["max_pixels"]
+
+
+def render_derivatives(content, variants, max_pixels):
+    """
+    Return {(width, format): bytes} for the requested (width, format) variants of an image.
+
+    Images are never upscaled: variants wider than the original keep its size
+    and are only recompressed. The size is read from the header before
+    anything is decoded, and images of more than max_pixels raise ValueError.
+    """
+    rendered = {}
+    with Image.open(io.BytesIO(content)) as original:
+        if original.width * original.height > max_pixels:
+            raise ValueError(f"Image of {original.width}x{original.height} pixels is over the {max_pixels} pixel limit")
+        original_format = original.format or "PNG"
+        image = ImageOps.exif_transpose(original)
+        for width in sorted({width for width, _ in variants}, reverse=True):
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            for variant_width, fmt in variants:
+                if variant_width == width:
+                    rendered[(width, fmt)] = _encode(image, "WEBP" if fmt == "webp" else original_format)
+    return rendered
+
+
+def read_missing_derivatives(field_file, force=False):
+    """
+    Return the content of an image and the {name: (width, format)} map of its missing derivatives.
+
+    Returns None when every derivative exists. With force, existing
+    derivatives are deleted and all of them are returned.
+    """
+    if not field_file:
+        return None
+    storage = field_file.storage
+    names = get_derivative_names(field_file.name)
+    if force:
+        for name in names:
+            storage.delete(name)
+        set_cached_image_derivatives(field_file.name, set(), MISSING_DERIVATIVES_CACHE_TIMEOUT)
+    else:
+        names = {name: variant for name, variant in names.items() if not storage.exists(name)}
+    if not names:
+        return None
+
+    with storage.open(field_file.name, "rb") as image_file:
+        return image_file.read(), names
+
+
+def save_derivatives(field_file, names, rendered):
+    """
+    Store rendered derivatives under their names, skipping any that already exist, and advertise them.
+
+    Returns the number of derivatives stored.
+    """
+    storage = field_file.storage
+    saved = 0
+    for name, variant in names.items():
+        if not storage.exists(name):
+            storage.save(name, ContentFile(rendered[variant]))
+            saved += 1
+    set_cached_image_derivatives(
+        field_file.name, set(get_derivative_names(field_file.name).values()), DERIVATIVES_CACHE_TIMEOUT
+    )
+    invalidate_image_consumers(field_file.instance)
+    return saved
+
+
+def invalidate_image_consumers(instance):
+    """
+    Invalidate the cached pages and snapshots showing the images of a partner, center or course creator.
+    """
+    # Centers and course creators belong to a partner, partners are their own
+    bump_partner_version(getattr(instance, "partner_id", instance.pk))
+    for name in IMAGE_SNAPSHOTS:
+        bump_snapshot_version(name)
+
+
+def generate_derivatives(field_file, force=False):
+    """
+    Render and store the missing derivatives of an image in the calling process.
+
+    Returns the number of derivatives stored.
+    """
+    missing = read_missing_derivatives(field_file, force=force)
+    if not missing:
+        return 0
+    content, names = missing
+    rendered = render_derivatives(content, list(names.values()), get_max_pixels(field_file))
+    return save_derivatives(field_file, names, rendered)
+
+
+def schedule_derivatives(model_name, pk, field_name):
+    """
+    Generate the missing derivatives of an image field of a course_partnerships object in a celery worker.
+    """
+    from .tasks import generate_image_derivatives_task  # pylint: disable=import-outside-toplevel
+
+    try:
+        generate_image_derivatives_task.delay(model_name, pk, field_name)
+    except Exception:  # pylint: disable=broad-exception-caught
+        log.exception("Could not schedule image derivatives of %s %s %s", model_name, pk, field_name)
@@ -1,41 +1,108 @@
-from django.core.management.base import BaseCommand
-from organizations.models import OrganizationCourse
+import time
 
-from course_partnerships.models import EnhancedCourse, PartnerOrganizationMapping
+from django.core.management.base import BaseCommand, CommandError
+
+from course_partnerships.assignment import assign_partner_rows, refresh_partner_data
+from course_partnerships.models import EnhancedCourse, Partner
 
 
 class Command(BaseCommand):
     """
     Command to auto-assign partners to courses based on organization mappings.
 
+    Courses are processed in batches of primary keys; each batch costs two
+    lookups and one bulk update, whatever its size.
+
     Example usage:
         ./manage.py assign_course_partners
+        ./manage.py assign_course_partners --reassign --only-partner school-slug --dry-run
     """
     help = "Auto-assign partners to courses based on organization mappings"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of courses processed per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be assigned without writing anything.",
+        )
+        parser.add_argument(
+            "--only-partner",
+            metavar="SLUG",
+            help="Only assign courses mapped to this partner.",
+        )
+        parser.add_argument(
+            "--reassign",
+            action="store_true",
+            help="Also process courses that already have a partner, moving them to their mapped partner.",
+        )
+        parser.add_argument(
+            "--show-assignments",
+            action="store_true",
+            help="Print one line per assigned course.",
+        )
+
     def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        only_partner_id = None
+        if options["only_partner"]:
+            try:
+                only_partner_id = Partner.objects.values_list("id", flat=True).get(slug=options["only_partner"])
+            except Partner.DoesNotExist:
+                raise CommandError(f"Unknown partner: {options['only_partner']}")
+
+        courses = EnhancedCourse.objects.order_by("id")
+        if not options["reassign"]:
+            courses = courses.filter(partner__isnull=True)
+
+        partner_names = dict(Partner.objects.values_list("id", "name")) if options["show_assignments"] else {}
+        started = time.monotonic()
+        courses_processed = 0
         courses_updated = 0
+        affected_partner_ids = set()
+        last_id = 0
 
-        # Get all EnhancedCourses without partners
-        courses = EnhancedCourse.objects.filter(partner__isnull=True)
+        while True:
+            rows = list(courses.filter(id__gt=last_id).values_list("id", "course_id", "partner_id")[:batch_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
 
-        for enhanced_course in courses:
-            try:
-                # Get organization for this course
-                org_course = OrganizationCourse.objects.filter(course_id=str(enhanced_course.course_id)).first()
-
-                if org_course:
-                    # Find partner mapping
-                    mapping = PartnerOrganizationMapping.objects.filter(organization=org_course.organization).first()
-
-                    if mapping:
-                        enhanced_course.partner = mapping.partner
-                        enhanced_course.save()
-                        courses_updated += 1
-                        self.stdout.write(
-                            self.style.SUCCESS(f"Assigned {mapping.partner.name} to {enhanced_course.course_id}")
-                        )
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                self.stdout.write(self.style.ERROR(f"Error processing {enhanced_course.course_id}: {e}"))
-
-        self.stdout.write(self.style.SUCCESS(f"Successfully updated {courses_updated} courses"))
+            updated, partner_ids = assign_partner_rows(
+                rows, only_partner_id=only_partner_id, dry_run=options["dry_run"]
+            )
+            courses_processed += len(rows)
+            courses_updated += len(updated)
+            affected_partner_ids |= partner_ids
+
+            if options["show_assignments"]:
+                for course in updated:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Assigned {partner_names.get(course.partner_id)} to {course.course_id}")
+                    )
+
+            elapsed = time.monotonic() - started
+            self.stderr.write(
+                f"Processed {courses_processed} courses, {courses_updated} assigned "
+                f"({courses_processed / max(elapsed, 0.001):.0f} courses/s)"
+            )
+
+        if not options["dry_run"]:
+            refresh_partner_data(affected_partner_ids)
+
+        elapsed = time.monotonic() - started
+        verb = "Would update" if options["dry_run"] else "Successfully updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {courses_updated} of {courses_processed} courses in {elapsed:.1f}s "
+                f"({courses_processed / max(elapsed, 0.001):.0f} courses/s)"
+            )
+        )
@@ -0,0 +1,65 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from course_partnerships.models import PartnerOrganizationMapping
+from course_partnerships.serializers import PartnerOrganizationMappingSerializer, serialize_partner_mappings
+
+
+class Command(BaseCommand):
+    """
+    Command to check that the values_list fast path of the partner mapping
+    serializer matches PartnerOrganizationMappingSerializer, and to compare
+    their speed on the current data.
+
+    Example usage:
+        ./manage.py benchmark_partner_serializers
+        ./manage.py benchmark_partner_serializers --all --repeat 20
+    """
+    help = "Check parity and compare the speed of the partner mapping serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Serialize every mapping instead of only those shown in the mobile app.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=10,
+            help="Number of timed runs of each serializer (default: 10).",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="Host used to build absolute logo URLs (default: localhost).",
+        )
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get("/api/partners/", HTTP_HOST=options["host"])
+        mappings = PartnerOrganizationMapping.objects.order_by("id")
+        if not options["all"]:
+            mappings = mappings.filter(show_in_mobile_app=True)
+
+        def run_serializer():
+            return PartnerOrganizationMappingSerializer(mappings.all(), many=True, context={"request": request}).data
+
+        def run_fast_path():
+            return serialize_partner_mappings(mappings.all(), request)
+
+        expected = [dict(item) for item in run_serializer()]
+        actual = run_fast_path()
+        if expected != actual:
+            mismatches = sum(1 for a, b in zip(expected, actual) if a != b) + abs(len(expected) - len(actual))
+            raise CommandError(f"Fast path output differs from the serializer on {mismatches} of {len(expected)} rows")
+
+        serializer_time = min(timeit.repeat(run_serializer, number=1, repeat=options["repeat"]))
+        fast_path_time = min(timeit.repeat(run_fast_path, number=1, repeat=options["repeat"]))
+        self.stdout.write(f"Rows: {len(expected)}")
+        self.stdout.write(f"PartnerOrganizationMappingSerializer: {serializer_time * 1000:.1f} ms")
+        self.stdout.write(f"serialize_partner_mappings: {fast_path_time * 1000:.1f} ms")
+        self.stdout.write(
+            self.style.SUCCESS(f"Outputs match; fast path is {serializer_time / max(fast_path_time, 1e-9):.1f}x faster")
+        )
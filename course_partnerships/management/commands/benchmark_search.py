@@ -0,0 +1,50 @@
+import statistics
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from course_partnerships.search import get_search_results, search
+
+
+class Command(BaseCommand):
+    """
+    Command to measure the latency of search queries on the current index.
+
+    Each query is ranked and its first page resolved like the search API does,
+    and the min, median and 95th percentile latencies are reported.
+
+    Example usage:
+        ./manage.py benchmark_search school
+        ./manage.py benchmark_search བོད ka "center ti" --repeat 50
+    """
+    help = "Measure the latency of search queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("queries", nargs="+", help="Queries to run.")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed runs of each query (default: 20).",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=20,
+            help="Number of results resolved per query (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        for query in options["queries"]:
+
+            def run_query(query=query):
+                ranked = search(query)
+                return ranked.count(), get_search_results(list(ranked[: options["page_size"]]))
+
+            count, _ = run_query()
+            timings = sorted(timeit.repeat(run_query, number=1, repeat=max(1, options["repeat"])))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{query!r}: {count} results, min {timings[0] * 1000:.1f} ms, "
+                f"median {statistics.median(timings) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+            )
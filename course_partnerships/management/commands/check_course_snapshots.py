@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand, CommandError
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from course_partnerships.cache import bump_partner_version
+from course_partnerships.models import COURSE_SNAPSHOT_FIELDS, EnhancedCourse
+from course_partnerships.snapshots import homepage_catalog
+
+
+class Command(BaseCommand):
+    """
+    Command to report EnhancedCourse rows whose copied course card fields differ from CourseOverview.
+
+    Rows are compared in batches, and reported as never copied, drifted (with
+    the differing fields) or orphaned when their CourseOverview is gone.
+    Orphaned rows are removed by `sweep_orphaned_courses`.
+
+    Example usage:
+        ./manage.py check_course_snapshots
+        ./manage.py check_course_snapshots --fix --verbosity 2
+    """
+    help = "Report drift between the course card fields of EnhancedCourse and CourseOverview"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of courses compared per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Copy the fields again for never copied and drifted courses.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        checked = 0
+        missing = []
+        drifted = []
+        orphaned = []
+        field_drift = {field: 0 for field in COURSE_SNAPSHOT_FIELDS}
+        courses = EnhancedCourse.objects.order_by("id").values(
+            "id", "course_id", "snapshot_refreshed", *COURSE_SNAPSHOT_FIELDS
+        )
+        last_id = 0
+        while True:
+            rows = list(courses.filter(id__gt=last_id)[:batch_size])
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            checked += len(rows)
+            overviews = {
+                str(overview.pop("id")): overview
+                for overview in CourseOverview.objects.filter(id__in=[row["course_id"] for row in rows]).values(
+                    "id", *COURSE_SNAPSHOT_FIELDS
+                )
+            }
+            for row in rows:
+                overview = overviews.get(str(row["course_id"]))
+                if overview is None:
+                    orphaned.append(row["course_id"])
+                elif row["snapshot_refreshed"] is None:
+                    missing.append(row["course_id"])
+                else:
+                    fields = [field for field in COURSE_SNAPSHOT_FIELDS if row[field] != overview[field]]
+                    if fields:
+                        drifted.append(row["course_id"])
+                        for field in fields:
+                            field_drift[field] += 1
+                        if options["verbosity"] > 1:
+                            self.stdout.write(f"{row['course_id']}: {', '.join(fields)}")
+
+        self.stdout.write(
+            f"Checked {checked} courses: {len(missing)} never copied, {len(drifted)} drifted, {len(orphaned)} orphaned"
+        )
+        for field, count in field_drift.items():
+            if count:
+                self.stdout.write(f"  {field}: {count}")
+
+        stale = missing + drifted
+        if options["fix"] and stale:
+            refreshed = 0
+            partner_ids = set()
+            for start in range(0, len(stale), batch_size):
+                updated, batch_partner_ids = EnhancedCourse.refresh_snapshots(stale[start : start + batch_size])
+                refreshed += updated
+                partner_ids |= batch_partner_ids
+            bump_partner_version(*partner_ids)
+            homepage_catalog.invalidate()
+            self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} courses"))
+        elif stale:
+            self.stdout.write(self.style.WARNING("Run with --fix to refresh the stale courses"))
+        if orphaned:
+            self.stdout.write(self.style.WARNING("Run sweep_orphaned_courses to remove the orphaned courses"))
+        if not (stale or orphaned):
+            self.stdout.write(self.style.SUCCESS("No drift found"))
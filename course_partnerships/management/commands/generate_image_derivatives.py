@@ -0,0 +1,89 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from course_partnerships.images import (
+    IMAGE_FIELDS,
+    get_max_pixels,
+    read_missing_derivatives,
+    render_derivatives,
+    save_derivatives,
+)
+
+
+class Command(BaseCommand):
+    """
+    Command to backfill the responsive derivatives of partner, center and
+    course creator images.
+
+    Images whose derivatives all exist are skipped, so the command can be
+    re-run safely.
+
+    Example usage:
+        ./manage.py generate_image_derivatives
+        ./manage.py generate_image_derivatives --workers 4 --force
+    """
+    help = "Generate missing resized/WebP derivatives of uploaded images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Number of processes rendering images (default: 2).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives that already exist.",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers must be a positive integer")
+
+        generated = 0
+        failed = 0
+        pending = {}
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            for field_file in self.iter_images():
+                try:
+                    missing = read_missing_derivatives(field_file, force=options["force"])
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"Error reading {field_file.name}: {e}"))
+                    continue
+                if missing:
+                    content, names = missing
+                    future = executor.submit(
+                        render_derivatives, content, list(names.values()), get_max_pixels(field_file)
+                    )
+                    pending[future] = (field_file, names)
+                # Bound the number of images held in memory at once
+                while len(pending) >= options["workers"] * 2:
+                    generated, failed = self.collect(pending, generated, failed)
+            while pending:
+                generated, failed = self.collect(pending, generated, failed)
+
+        self.stdout.write(self.style.SUCCESS(f"Generated {generated} derivatives, {failed} images failed"))
+
+    def iter_images(self):
+        for model_name, field_names in IMAGE_FIELDS.items():
+            model = apps.get_model("course_partnerships", model_name)
+            for row in model.objects.only(*field_names).iterator():
+                for field_name in field_names:
+                    field_file = getattr(row, field_name)
+                    if field_file:
+                        yield field_file
+
+    def collect(self, pending, generated, failed):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            field_file, names = pending.pop(future)
+            try:
+                generated += save_derivatives(field_file, names, future.result())
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"Error processing {field_file.name}: {e}"))
+        return generated, failed
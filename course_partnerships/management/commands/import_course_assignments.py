@@ -0,0 +1,272 @@
+import csv
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from course_partnerships.assignment import refresh_partner_data
+from course_partnerships.models import Category, Center, EnhancedCourse, Partner
+
+COLUMNS = ("course_id", "partner_slug", "center_slug", "category")
+
+
+class RowError(ValueError):
+    """
+    Raised when an import row cannot be applied.
+    """
+
+
+class Command(BaseCommand):
+    """
+    Command to assign partners, centers and categories to courses from a CSV or JSON Lines file.
+
+    Every row has a `course_id` and any of `partner_slug`, `center_slug` and
+    `category` (a category id or name); empty values leave the current
+    assignment unchanged. A center is looked up among the centers of the row's
+    partner, or of the course's current partner. Missing EnhancedCourse rows
+    are created for courses known to the platform.
+
+    The file is streamed and applied in batches, each validated in full and
+    written with one bulk update in its own transaction. Invalid rows are
+    skipped and listed in the error report.
+
+    Example usage:
+        ./manage.py import_course_assignments school-courses.csv
+        ./manage.py import_course_assignments courses.jsonl --errors errors.csv --dry-run
+        cat courses.csv | ./manage.py import_course_assignments - --format csv
+    """
+    help = "Assign partners, centers and categories to courses from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON Lines file to import, or - for standard input.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="File format (default: guessed from the file extension, csv for standard input).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows applied per transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--errors",
+            metavar="PATH",
+            help="Write the rejected rows, with their line number and error, to this CSV file.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate every row and report what would change without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+        path = options["path"]
+        file_format = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+
+        self.dry_run = options["dry_run"]
+        self.partners = {}
+        self.centers = {}
+        self.categories = {}
+        self.errors = []
+        self.updated = 0
+        self.created = 0
+        started = time.monotonic()
+        rows_read = 0
+
+        opener = nullcontext(sys.stdin) if path == "-" else open(path, newline="", encoding="utf-8-sig")
+        try:
+            with opener as source:
+                batch = []
+                for line, row in self.read_rows(source, file_format):
+                    batch.append((line, row))
+                    rows_read += 1
+                    if len(batch) >= batch_size:
+                        self.apply_batch(batch)
+                        batch = []
+                if batch:
+                    self.apply_batch(batch)
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+        if options["errors"]:
+            with open(options["errors"], "w", newline="", encoding="utf-8") as report:
+                writer = csv.writer(report)
+                writer.writerow(["line", "course_id", "error"])
+                writer.writerows(self.errors)
+        else:
+            for line, course_id, error in self.errors:
+                self.stderr.write(f"Line {line} ({course_id}): {error}")
+
+        verb = "Would update" if self.dry_run else "Updated"
+        message = (
+            f"{verb} {self.updated} courses from {rows_read} rows in {time.monotonic() - started:.1f}s, "
+            f"with {self.created} missing EnhancedCourse rows; {len(self.errors)} rows rejected"
+        )
+        self.stdout.write(self.style.WARNING(message) if self.errors else self.style.SUCCESS(message))
+
+    def read_rows(self, source, file_format):
+        """
+        Yield (line number, row dict) for every row of the source, streaming it.
+        """
+        if file_format == "csv":
+            reader = csv.DictReader(source)
+            missing = [column for column in ("course_id",) if column not in (reader.fieldnames or [])]
+            if missing:
+                raise CommandError(f"Missing CSV columns: {', '.join(missing)} (expected {', '.join(COLUMNS)})")
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line, text in enumerate(source, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as e:
+                self.errors.append((line, "", f"Invalid JSON: {e}"))
+                continue
+            if not isinstance(row, dict):
+                self.errors.append((line, "", "Expected a JSON object"))
+                continue
+            yield line, row
+
+    def apply_batch(self, batch):
+        """
+        Validate a batch of rows and apply the valid ones in a single transaction.
+        """
+        parsed = []
+        for line, row in batch:
+            values = {column: str(row.get(column) or "").strip() for column in COLUMNS}
+            try:
+                parsed.append((line, values, CourseKey.from_string(values["course_id"])))
+            except InvalidKeyError:
+                self.errors.append((line, values["course_id"], "Invalid course id"))
+
+        course_keys = {course_key for _, _, course_key in parsed}
+        changed = {}
+        affected_partner_ids = set()
+        with transaction.atomic() if not self.dry_run else nullcontext():
+            courses = self.get_courses(course_keys)
+            for line, values, course_key in parsed:
+                course = courses.get(course_key)
+                if course is None:
+                    self.errors.append((line, values["course_id"], "Unknown course"))
+                    continue
+                try:
+                    assignment = self.resolve(values, course)
+                except RowError as e:
+                    self.errors.append((line, values["course_id"], str(e)))
+                    continue
+                current = (course.partner_id, course.center_id, course.category_id)
+                if assignment == current:
+                    continue
+                affected_partner_ids.update((current[0], assignment[0]))
+                course.partner_id, course.center_id, course.category_id = assignment
+                course.modified = timezone.now()
+                changed[course_key] = course
+
+            if changed and not self.dry_run:
+                EnhancedCourse.objects.bulk_update(changed.values(), ["partner", "center", "category", "modified"])
+
+        self.updated += len(changed)
+        if changed and not self.dry_run:
+            refresh_partner_data(affected_partner_ids)
+
+    def get_courses(self, course_keys):
+        """
+        Return {course_key: EnhancedCourse} for the given courses, creating the missing rows of known courses.
+        """
+        fields = ("id", "course_id", "partner_id", "center_id", "category_id")
+        existing = EnhancedCourse.objects.filter(course_id__in=course_keys).only(*fields)
+        courses = {course.course_id: course for course in existing}
+        missing = [course_key for course_key in course_keys if course_key not in courses]
+        if missing:
+            known = list(CourseOverview.objects.filter(id__in=missing).values_list("id", flat=True))
+            new_courses = [EnhancedCourse(course_id=course_key) for course_key in known]
+            if new_courses and not self.dry_run:
+                EnhancedCourse.objects.bulk_create(new_courses, ignore_conflicts=True)
+                new_courses = EnhancedCourse.objects.filter(course_id__in=known).only(*fields)
+            courses.update((course.course_id, course) for course in new_courses)
+            self.created += len(known)
+        return courses
+
+    def resolve(self, values, course):
+        """
+        Return the (partner_id, center_id, category_id) a row assigns to a course.
+        """
+        partner_id, center_id, category_id = course.partner_id, course.center_id, course.category_id
+
+        if values["partner_slug"]:
+            partner_id = self.get_partner_id(values["partner_slug"])
+            if partner_id != course.partner_id and not values["center_slug"]:
+                center_id = None
+
+        if values["center_slug"]:
+            if partner_id is None:
+                raise RowError("A center needs a partner")
+            center_id = self.get_center_id(partner_id, values["center_slug"])
+
+        if values["category"]:
+            category_id = self.get_category_id(values["category"], partner_id)
+
+        return partner_id, center_id, category_id
+
+    def get_partner_id(self, slug):
+        if slug not in self.partners:
+            self.partners[slug] = Partner.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if self.partners[slug] is None:
+            raise RowError(f"Unknown partner: {slug}")
+        return self.partners[slug]
+
+    def get_center_id(self, partner_id, slug):
+        key = (partner_id, slug)
+        if key not in self.centers:
+            centers = Center.objects.filter(partner_id=partner_id, slug=slug)
+            self.centers[key] = centers.values_list("id", flat=True).first()
+        if self.centers[key] is None:
+            raise RowError(f"Unknown center for this partner: {slug}")
+        return self.centers[key]
+
+    def get_category_id(self, value, partner_id):
+        """
+        Return the id of a category given by id or by name.
+
+        Names are matched case-insensitively; among categories sharing a name,
+        the one of the partner is preferred over shared ones.
+        """
+        key = (value, partner_id)
+        if key not in self.categories:
+            self.categories[key] = self.find_category(value, partner_id)
+        category_id, error = self.categories[key]
+        if error:
+            raise RowError(error)
+        return category_id
+
+    def find_category(self, value, partner_id):
+        """
+        Return (category_id, None), or (None, error message) when the category is unknown or ambiguous.
+        """
+        if value.isdigit():
+            matches = list(Category.objects.filter(id=int(value)).values_list("id", flat=True))
+        else:
+            candidates = list(Category.objects.filter(name__iexact=value).values_list("id", "partner_id"))
+            own = [pk for pk, category_partner_id in candidates if category_partner_id == partner_id]
+            shared = [pk for pk, category_partner_id in candidates if category_partner_id is None]
+            matches = own or shared or [pk for pk, _ in candidates]
+        if not matches:
+            return None, f"Unknown category: {value}"
+        if len(matches) > 1:
+            return None, f"Ambiguous category: {value}"
+        return matches[0], None
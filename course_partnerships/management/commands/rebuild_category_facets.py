@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from course_partnerships.cache import bump_partner_version
+from course_partnerships.models import Partner, PartnerCategoryCount
+
+
+class Command(BaseCommand):
+    """
+    Command to rebuild the per-partner category course counts from scratch.
+
+    Example usage:
+        ./manage.py rebuild_category_facets
+        ./manage.py rebuild_category_facets --partner school-slug
+    """
+    help = "Rebuild the per-partner category course counts from EnhancedCourse"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--partner",
+            action="append",
+            dest="partner_slugs",
+            metavar="SLUG",
+            help="Only rebuild the counts of this partner. Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        partner_ids = None
+        if options["partner_slugs"]:
+            partner_ids = list(Partner.objects.filter(slug__in=options["partner_slugs"]).values_list("id", flat=True))
+
+        rows = PartnerCategoryCount.rebuild(partner_ids)
+        bump_partner_version(*(partner_ids or Partner.objects.values_list("id", flat=True)))
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully rebuilt {rows} category counts"))
@@ -0,0 +1,149 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from organizations.models import OrganizationCourse
+
+from course_partnerships.assignment import assign_partner_rows, refresh_partner_data
+from course_partnerships.models import EnhancedCourse, SyncCheckpoint
+
+CHECKPOINT_NAME = "reconcile_enhanced_courses"
+
+
+def parse_course_keys(course_ids):
+    """
+    Return the CourseKeys of the given course id strings, skipping invalid ones.
+    """
+    course_keys = []
+    for course_id in course_ids:
+        try:
+            course_keys.append(CourseKey.from_string(course_id))
+        except InvalidKeyError:
+            continue
+    return course_keys
+
+
+class Command(BaseCommand):
+    """
+    Command to incrementally reconcile EnhancedCourse with the course catalog.
+
+    Only the CourseOverview and OrganizationCourse rows modified since the last
+    run are looked at. Missing EnhancedCourse rows are created in bulk and
+    courses without a partner get their mapped partner in the same pass. The
+    latest `modified` timestamp seen is stored as a checkpoint for the next run,
+    which makes the command cheap enough to run every few minutes from cron.
+
+    Example usage:
+        ./manage.py reconcile_enhanced_courses
+        ./manage.py reconcile_enhanced_courses --full --dry-run
+    """
+    help = "Backfill EnhancedCourse rows and assign partners for courses changed since the last run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of source rows processed per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore the stored checkpoint and reconcile every course.",
+        )
+        parser.add_argument(
+            "--overlap",
+            type=int,
+            default=60,
+            help="Seconds to re-scan before the checkpoint, for rows committed late (default: 60).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without writing anything, including the checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        self.batch_size = options["batch_size"]
+        self.dry_run = options["dry_run"]
+        self.created = 0
+        self.assigned = 0
+        self.affected_partner_ids = set()
+        started = time.monotonic()
+
+        checkpoint, _ = SyncCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+        since = None
+        if checkpoint.high_water_mark and not options["full"]:
+            since = checkpoint.high_water_mark - timedelta(seconds=options["overlap"])
+
+        overviews = CourseOverview.objects.all()
+        org_courses = OrganizationCourse.objects.all()
+        if since:
+            overviews = overviews.filter(modified__gte=since)
+            org_courses = org_courses.filter(modified__gte=since)
+
+        high_water_marks = [checkpoint.high_water_mark]
+        scanned = 0
+        for rows in self.iter_batches(overviews, "id"):
+            self.reconcile([course_id for course_id, _ in rows], create=True)
+            high_water_marks.append(rows[-1][1])
+            scanned += len(rows)
+        for rows in self.iter_batches(org_courses, "id", "course_id"):
+            self.reconcile(parse_course_keys(course_id for _, _, course_id in rows), create=False)
+            high_water_marks.append(rows[-1][1])
+            scanned += len(rows)
+
+        if not self.dry_run:
+            refresh_partner_data(self.affected_partner_ids)
+            checkpoint.high_water_mark = max(filter(None, high_water_marks), default=None)
+            checkpoint.save()
+
+        verb = "Would create" if self.dry_run else "Created"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {self.created} courses and assigned {self.assigned} partners "
+                f"from {scanned} changed rows in {time.monotonic() - started:.1f}s"
+            )
+        )
+
+    def iter_batches(self, queryset, key, *fields):
+        """
+        Yield lists of (key, modified, *fields) tuples in (modified, key) order, using keyset pagination.
+        """
+        queryset = queryset.order_by("modified", key)
+        last = None
+        while True:
+            batch = queryset
+            if last is not None:
+                batch = batch.filter(Q(modified__gt=last[1]) | Q(modified=last[1], **{f"{key}__gt": last[0]}))
+            rows = list(batch.values_list(key, "modified", *fields)[: self.batch_size])
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][:2]
+
+    def reconcile(self, course_ids, create):
+        """
+        Create the missing EnhancedCourse rows of the given courses and assign their partners.
+        """
+        courses = EnhancedCourse.objects.filter(course_id__in=course_ids)
+        if create:
+            existing = {str(course_id) for course_id in courses.values_list("course_id", flat=True)}
+            missing = [course_id for course_id in course_ids if str(course_id) not in existing]
+            if missing and not self.dry_run:
+                EnhancedCourse.objects.bulk_create(
+                    [EnhancedCourse(course_id=course_id) for course_id in missing], ignore_conflicts=True
+                )
+            self.created += len(missing)
+
+        rows = list(courses.filter(partner__isnull=True).values_list("id", "course_id", "partner_id"))
+        updated, partner_ids = assign_partner_rows(rows, dry_run=self.dry_run)
+        self.assigned += len(updated)
+        self.affected_partner_ids |= partner_ids
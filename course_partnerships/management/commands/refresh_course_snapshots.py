@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from course_partnerships.cache import bump_partner_version
+from course_partnerships.models import EnhancedCourse
+from course_partnerships.snapshots import homepage_catalog
+
+
+class Command(BaseCommand):
+    """
+    Command to copy the course card fields of every EnhancedCourse from CourseOverview.
+
+    Fields are normally copied when a course is published. This backfills rows
+    created before, or fixes the drift reported by `check_course_snapshots`,
+    with one bulk update per batch.
+
+    Example usage:
+        ./manage.py refresh_course_snapshots
+        ./manage.py refresh_course_snapshots --only-missing --batch-size 500
+    """
+    help = "Copy the course card fields of EnhancedCourse rows from CourseOverview"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of courses refreshed per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Only refresh the courses whose fields were never copied.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        courses = EnhancedCourse.objects.all()
+        if options["only_missing"]:
+            courses = courses.filter(snapshot_refreshed__isnull=True)
+
+        started = time.monotonic()
+        refreshed = 0
+        partner_ids = set()
+        last_id = 0
+        while True:
+            rows = list(courses.filter(id__gt=last_id).order_by("id").values_list("id", "course_id")[:batch_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updated, batch_partner_ids = EnhancedCourse.refresh_snapshots([course_id for _, course_id in rows])
+            refreshed += updated
+            partner_ids |= batch_partner_ids
+
+        bump_partner_version(*partner_ids)
+        homepage_catalog.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} courses in {time.monotonic() - started:.1f}s"))
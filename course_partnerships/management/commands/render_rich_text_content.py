@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from course_partnerships.cache import bump_partner_version
+from course_partnerships.models import Center, Partner
+from course_partnerships.richtext import RenderedContentMixin
+
+
+class Command(BaseCommand):
+    """
+    Command to render the rich text content of every partner and center again.
+
+    Content is rendered when it is saved; run this after changing the
+    sanitizer rules so that existing descriptions follow them.
+
+    Example usage:
+        ./manage.py render_rich_text_content
+    """
+    help = "Render the sanitized HTML, excerpt and metadata of partner and center descriptions"
+
+    def handle(self, *args, **options):
+        partner_ids = set()
+        rendered = 0
+        for model in (Partner, Center):
+            instances = list(model.objects.all())
+            for instance in instances:
+                instance.render_content()
+            model.objects.bulk_update(instances, RenderedContentMixin.rendered_content_fields, batch_size=100)
+            partner_ids.update(instance.id if model is Partner else instance.partner_id for instance in instances)
+            rendered += len(instances)
+
+        bump_partner_version(*partner_ids)
+        self.stdout.write(self.style.SUCCESS(f"Successfully rendered {rendered} descriptions"))
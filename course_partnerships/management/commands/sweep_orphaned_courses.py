@@ -0,0 +1,111 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+from course_partnerships.models import EnhancedCourse
+
+
+class Command(BaseCommand):
+    """
+    Command to delete rows pointing at courses that no longer exist.
+
+    EnhancedCourse and the wishlist tables reference CourseOverview without a
+    database constraint, so rows of deleted courses stay behind when the
+    course_deleted signal is missed. Each table is scanned in primary key
+    batches, orphans are found with an anti-join against CourseOverview and
+    deleted in bounded batches.
+
+    Example usage:
+        ./manage.py sweep_orphaned_courses --dry-run
+        ./manage.py sweep_orphaned_courses --batch-size 500 --max-deletes-per-second 200
+    """
+    help = "Delete EnhancedCourse and wishlist rows of courses that no longer exist"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows scanned per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--max-deletes-per-second",
+            type=float,
+            default=0,
+            help="Pause between batches to stay under this delete rate (default: unlimited).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report orphaned rows without deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        self.batch_size = options["batch_size"]
+        self.rate = options["max_deletes_per_second"]
+        self.dry_run = options["dry_run"]
+
+        models = [EnhancedCourse]
+        if apps.is_installed("wishlist"):
+            models += [apps.get_model("wishlist", "Wishlist"), apps.get_model("wishlist", "WishlistCounter")]
+
+        for model in models:
+            started = time.monotonic()
+            scanned, orphaned = self.sweep(model)
+            verb = "Would delete" if self.dry_run else "Deleted"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model._meta.label}: scanned {scanned} rows, {verb.lower()} {orphaned} orphans "
+                    f"in {time.monotonic() - started:.1f}s"
+                )
+            )
+
+    def sweep(self, model):
+        """
+        Delete the orphaned rows of a model, returning the numbers of scanned and orphaned rows.
+        """
+        course_exists = Exists(CourseOverview.objects.filter(id=OuterRef("course_id")))
+        scanned = 0
+        orphaned = 0
+        last_pk = None
+
+        while True:
+            rows = model.objects.order_by("pk")
+            if last_pk is not None:
+                rows = rows.filter(pk__gt=last_pk)
+            pks = list(rows.values_list("pk", flat=True)[: self.batch_size])
+            if not pks:
+                return scanned, orphaned
+            last_pk = pks[-1]
+            scanned += len(pks)
+
+            orphans = model.objects.filter(pk__gte=pks[0], pk__lte=last_pk).filter(~course_exists)
+            orphan_pks = list(orphans.values_list("pk", flat=True))
+            if not orphan_pks:
+                continue
+            orphaned += len(orphan_pks)
+            if self.dry_run:
+                continue
+
+            started = time.monotonic()
+            self.delete(model, orphan_pks)
+            if self.rate:
+                time.sleep(max(0, len(orphan_pks) / self.rate - (time.monotonic() - started)))
+
+    def delete(self, model, pks):
+        rows = model.objects.filter(pk__in=pks)
+        if model._meta.label == "wishlist.Wishlist":
+            from wishlist.cache import invalidate_cached_course_ids
+
+            user_ids = set(rows.values_list("user_id", flat=True))
+            rows.delete()
+            for user_id in user_ids:
+                invalidate_cached_course_ids(user_id)
+        else:
+            rows.delete()
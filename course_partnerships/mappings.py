@@ -0,0 +1,55 @@
+"""
+Organization to partner resolution
+
+The mappings change rarely but are needed on every course publish, so each
+process keeps them in memory and only checks a version number kept in the
+shared cache before using them.
+"""
+
+import threading
+
+from .cache import get_organization_partners_version
+from .models import PartnerOrganizationMapping
+
+
+class OrganizationPartnerMap:
+    """
+    Process-local map from organization id to partner id.
+
+    When several partners are mapped to the same organization, the oldest
+    mapping wins.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._partners = {}
+
+    def get_partner_id(self, organization_id):
+        """
+        Return the id of the partner mapped to an organization, or None.
+        """
+        return self.get_partners().get(organization_id)
+
+    def get_partners(self):
+        """
+        Return the whole {organization_id: partner_id} map, reloading it if stale.
+        """
+        version = get_organization_partners_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._partners = self.load()
+                    self._version = version
+        return self._partners
+
+    @staticmethod
+    def load():
+        partners = {}
+        mappings = PartnerOrganizationMapping.objects.order_by("id").values_list("organization_id", "partner_id")
+        for organization_id, partner_id in mappings:
+            partners.setdefault(organization_id, partner_id)
+        return partners
+
+
+organization_partners = OrganizationPartnerMap()
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.19 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0007_coursecreator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartnerCategoryCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facet_counts', to='course_partnerships.category')),
+                ('center', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='category_counts', to='course_partnerships.center')),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_counts', to='course_partnerships.partner')),
+            ],
+            options={
+                'verbose_name': 'Partner Category Count',
+                'verbose_name_plural': 'Partner Category Counts',
+                'unique_together': {('partner', 'center', 'category')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.19 on 2026-10-18 13:20
+
+import course_partnerships.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0009_synccheckpoint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='center',
+            name='banner',
+            field=models.ImageField(blank=True, help_text='Upload only image file with .png, .jpeg, .jpg extension.', null=True, upload_to='center/', validators=[course_partnerships.validators.validate_bannner_extension, course_partnerships.validators.ImageUploadValidator('banner')], verbose_name='Banner'),
+        ),
+        migrations.AlterField(
+            model_name='center',
+            name='logo',
+            field=models.ImageField(help_text='Upload only image file with .png, .jpeg, .jpg extension. Recommended image size: W 240px * H 340px', upload_to='center/', validators=[course_partnerships.validators.validate_bannner_extension, course_partnerships.validators.ImageUploadValidator('logo')], verbose_name='logo'),
+        ),
+        migrations.AlterField(
+            model_name='coursecreator',
+            name='profile_picture',
+            field=models.ImageField(blank=True, help_text='Upload only image file with .png, .jpeg, .jpg extension.', null=True, upload_to='course_creators/', validators=[course_partnerships.validators.validate_bannner_extension, course_partnerships.validators.ImageUploadValidator('profile_picture')], verbose_name='Profile Picture'),
+        ),
+        migrations.AlterField(
+            model_name='partner',
+            name='banner',
+            field=models.ImageField(blank=True, help_text='Upload only image file with .png, .jpeg, .jpg extension.', null=True, upload_to='partner/', validators=[course_partnerships.validators.validate_bannner_extension, course_partnerships.validators.ImageUploadValidator('banner')], verbose_name='Banner'),
+        ),
+        migrations.AlterField(
+            model_name='partner',
+            name='logo',
+            field=models.ImageField(help_text='Upload only image file with .png, .jpeg, .jpg extension. Recommended image size: W 240px * H 340px', upload_to='partner/', validators=[course_partnerships.validators.validate_bannner_extension, course_partnerships.validators.ImageUploadValidator('logo')], verbose_name='logo'),
+        ),
+    ]
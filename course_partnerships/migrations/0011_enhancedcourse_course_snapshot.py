@@ -0,0 +1,63 @@
+# Generated by Django 4.2.19 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0010_image_upload_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='course_image_url',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='display_name',
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='display_number_with_default',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='display_org_with_default',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='end',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='language',
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='self_paced',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='short_description',
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='snapshot_refreshed',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='enhancedcourse',
+            name='start',
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.19 on 2026-10-18 17:45
+
+from django.db import migrations, models
+
+SLUG_MAX_LENGTH = 255
+
+
+def make_unique_slug(slug, pk, taken):
+    """
+    Return slug, shortened to the new maximum length, or a variant suffixed
+    with the row id when it is already taken.
+    """
+    base = slug = slug[:SLUG_MAX_LENGTH]
+    suffix = f"-{pk}"
+    while slug in taken:
+        slug = f"{base[:SLUG_MAX_LENGTH - len(suffix)]}{suffix}"
+        suffix = f"{suffix}-{pk}"
+    return slug
+
+
+def deduplicate_slugs(apps, schema_editor):
+    """
+    Rename the slugs that would break the new unique constraints.
+
+    The oldest partner or center keeps its slug, later duplicates get their id
+    appended.
+    """
+    Partner = apps.get_model('course_partnerships', 'Partner')
+    Center = apps.get_model('course_partnerships', 'Center')
+
+    taken = set()
+    for partner in Partner.objects.order_by('id').only('id', 'slug'):
+        slug = make_unique_slug(partner.slug, partner.id, taken)
+        if slug != partner.slug:
+            Partner.objects.filter(id=partner.id).update(slug=slug)
+        taken.add(slug)
+
+    taken_by_partner = {}
+    for center in Center.objects.order_by('id').only('id', 'partner_id', 'slug'):
+        taken = taken_by_partner.setdefault(center.partner_id, set())
+        slug = make_unique_slug(center.slug, center.id, taken)
+        if slug != center.slug:
+            Center.objects.filter(id=center.id).update(slug=slug)
+        taken.add(slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0011_enhancedcourse_course_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='partner',
+            name='slug',
+            field=models.SlugField(max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='center',
+            name='slug',
+            field=models.SlugField(max_length=255),
+        ),
+        migrations.AlterUniqueTogether(
+            name='center',
+            unique_together={('partner', 'slug')},
+        ),
+    ]
@@ -0,0 +1,231 @@
+# Generated by Django 4.2.19 on 2026-10-18 18:10
+
+import re
+from collections import namedtuple
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.db import migrations, models
+
+# Frozen copy of course_partnerships.richtext as of this migration, so that
+# later changes to the sanitizer do not change what this migration does.
+
+EXCERPT_LENGTH = 300
+# Length of the content_first_image columns; longer image URLs are not used as the first image
+FIRST_IMAGE_MAX_LENGTH = 1024
+
+ALLOWED_TAGS = set(
+    'a b blockquote br code div em figcaption figure h1 h2 h3 h4 h5 h6 hr i img li ol p pre s span strong sub sup '
+    'table tbody td tfoot th thead tr u ul'.split()
+)
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'}
+VOID_TAGS = {'br', 'hr', 'img'}
+DROPPED_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'textarea'}
+BLOCK_TAGS = set('blockquote br div figcaption figure h1 h2 h3 h4 h5 h6 hr li p pre td th tr'.split())
+TSHEG = '\u0f0b'
+
+URL_RE = re.compile(r"\bhttps?://[^\s<>\"']+[^\s<>\"'.,;:!?)\]]")
+# Words are runs of characters between whitespace and Tibetan tsheg/shad marks,
+# so that Tibetan text, written without spaces, is counted by syllable.
+WORD_RE = re.compile(r'[^\s\u0f0b-\u0f14]+')
+
+RenderedContent = namedtuple('RenderedContent', ['html', 'excerpt', 'word_count', 'first_image'])
+
+
+def is_safe_url(url):
+    try:
+        return urlsplit(url.strip()).scheme.lower() in ALLOWED_SCHEMES
+    except ValueError:
+        return False
+
+
+def format_attributes(attrs):
+    return ''.join(f' {name}="{escape(value)}"' for name, value in attrs)
+
+
+class RichTextSanitizer(HTMLParser):
+    """
+    HTML parser writing out the sanitized markup and plain text of a document.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.first_image = ''
+        self._open_tags = []
+        self._dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping += 1
+            return
+        if self._dropping or tag not in ALLOWED_TAGS:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        kept = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not is_safe_url(value):
+                continue
+            kept.append((name, value))
+        if tag == 'img':
+            src = dict(kept).get('src')
+            if not src:
+                return
+            if not self.first_image and len(src) <= FIRST_IMAGE_MAX_LENGTH:
+                self.first_image = src
+        if tag == 'a':
+            kept.append(('rel', 'nofollow noopener'))
+
+        self.html.append(f'<{tag}{format_attributes(kept)}>')
+        if tag not in VOID_TAGS:
+            self._open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping = max(0, self._dropping - 1)
+            return
+        if self._dropping or tag not in self._open_tags:
+            return
+        while self._open_tags:
+            open_tag = self._open_tags.pop()
+            self.html.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+    def handle_data(self, data):
+        if self._dropping:
+            return
+        self.text.append(data)
+        if 'a' in self._open_tags:
+            self.html.append(escape(data))
+            return
+        position = 0
+        for match in URL_RE.finditer(data):
+            url = match.group()
+            self.html.append(escape(data[position:match.start()]))
+            self.html.append(f'<a href="{escape(url)}" rel="nofollow noopener">{escape(url)}</a>')
+            position = match.end()
+        self.html.append(escape(data[position:]))
+
+    def close(self):
+        super().close()
+        while self._open_tags:
+            self.html.append(f'</{self._open_tags.pop()}>')
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """
+    Return text cut at a word boundary to at most length characters, with an ellipsis if shortened.
+    """
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    boundary = max(cut.rfind(' '), cut.rfind(TSHEG))
+    if boundary > length // 2:
+        cut = cut[:boundary + 1 if cut[boundary] == TSHEG else boundary]
+    return f'{cut.rstrip()}…'
+
+
+def render_rich_text(content):
+    """
+    Return the sanitized HTML, excerpt, word count and first image URL of rich text content.
+    """
+    sanitizer = RichTextSanitizer()
+    sanitizer.feed(content or '')
+    sanitizer.close()
+    text = ' '.join(''.join(sanitizer.text).split())
+    return RenderedContent(
+        html=''.join(sanitizer.html),
+        excerpt=make_excerpt(text),
+        word_count=len(WORD_RE.findall(text)),
+        first_image=sanitizer.first_image,
+    )
+
+
+
+def render_content(apps, schema_editor):
+    """
+    Render the content of the existing partners and centers.
+    """
+    for model_name in ('Partner', 'Center'):
+        model = apps.get_model('course_partnerships', model_name)
+        for instance in model.objects.only('id', 'content'):
+            rendered = render_rich_text(instance.content)
+            model.objects.filter(id=instance.id).update(
+                content_html=rendered.html,
+                content_excerpt=rendered.excerpt,
+                content_word_count=rendered.word_count,
+                content_first_image=rendered.first_image,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0012_unique_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='center',
+            name='content_excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='content_first_image',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='content_word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='content_excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='content_first_image',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='content_word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.19 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0013_rendered_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('partner', 'School/Partner'), ('center', 'Center'), ('course_creator', 'Course Creator'), ('category', 'Category')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('weight', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Search Term',
+                'verbose_name_plural': 'Search Terms',
+                'indexes': [models.Index(fields=['kind', 'object_id'], name='search_term_object_idx')],
+                'unique_together': {('term', 'kind', 'object_id')},
+            },
+        ),
+    ]
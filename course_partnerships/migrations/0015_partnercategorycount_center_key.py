@@ -0,0 +1,53 @@
+# Generated by Django 4.2.19 on 2026-10-18 20:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def rebuild_category_counts(apps, schema_editor):
+    """
+    Recompute the counts from EnhancedCourse, filling center_key.
+
+    Partner-level rows could be duplicated, and then adjusted twice, while the
+    old unique constraint ignored them, so existing counts are not trusted.
+    """
+    EnhancedCourse = apps.get_model('course_partnerships', 'EnhancedCourse')
+    PartnerCategoryCount = apps.get_model('course_partnerships', 'PartnerCategoryCount')
+
+    courses = EnhancedCourse.objects.filter(partner__isnull=False, category__isnull=False)
+    rows = [
+        PartnerCategoryCount(
+            partner_id=row['partner_id'],
+            center_id=row['center_id'],
+            center_key=row['center_id'] or 0,
+            category_id=row['category_id'],
+            course_count=row['course_count'],
+        )
+        for row in courses.values('partner_id', 'center_id', 'category_id').annotate(course_count=Count('id'))
+    ]
+    PartnerCategoryCount.objects.all().delete()
+    PartnerCategoryCount.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_partnerships', '0014_searchterm'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='partnercategorycount',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='partnercategorycount',
+            name='center_key',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(rebuild_category_counts, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='partnercategorycount',
+            unique_together={('partner', 'center_key', 'category')},
+        ),
+    ]
@@ -10,16 +10,21 @@ file and check it in at the same time as your model changes. To do that,
 """
 
 from ckeditor.fields import RichTextField
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from organizations.models import Organization
 
-from .validators import validate_bannner_extension
+from .images import ImageDerivativesMixin
+from .pagination import DEFAULT_PAGE_SIZE, paginate_by_keyset
+from .richtext import RenderedContentMixin
+from .validators import ImageUploadValidator, validate_bannner_extension
 
 
-class Partner(TimeStampedModel):
+class Partner(ImageDerivativesMixin, RenderedContentMixin, TimeStampedModel):
     """
     Model for store schools and partners details
     """
@@ -29,8 +34,8 @@ class Partner(TimeStampedModel):
         db_index=True,
     )
     slug = models.SlugField(
-        max_length=1024,
-        db_index=True,
+        max_length=255,
+        unique=True,
     )
     logo = models.ImageField(
         "logo",
@@ -38,7 +43,7 @@ class Partner(TimeStampedModel):
         help_text=_(
             "Upload only image file with .png, .jpeg, .jpg extension. Recommended image size: W 240px * H 340px"
         ),
-        validators=[validate_bannner_extension],
+        validators=[validate_bannner_extension, ImageUploadValidator("logo")],
     )
     banner = models.ImageField(
         "Banner",
@@ -46,9 +51,14 @@ class Partner(TimeStampedModel):
         null=True,
         upload_to="partner/",
         help_text=_("Upload only image file with .png, .jpeg, .jpg extension."),
-        validators=[validate_bannner_extension],
+        validators=[validate_bannner_extension, ImageUploadValidator("banner")],
     )
     content = RichTextField("Description", null=True, blank=True)
+    # Rendered from content on save, see RenderedContentMixin
+    content_html = models.TextField(blank=True, default="", editable=False)
+    content_excerpt = models.TextField(blank=True, default="", editable=False)
+    content_word_count = models.PositiveIntegerField(default=0, editable=False)
+    content_first_image = models.CharField(max_length=1024, blank=True, default="", editable=False)
     activate_school_admin = models.BooleanField(default=False)
 
     def __str__(self):
@@ -60,7 +70,7 @@ class Partner(TimeStampedModel):
         verbose_name_plural = "Schools and Partners"
 
 
-class Center(TimeStampedModel):
+class Center(ImageDerivativesMixin, RenderedContentMixin, TimeStampedModel):
     """
     Model for store Center details
     """
@@ -70,17 +80,14 @@ class Center(TimeStampedModel):
         max_length=1024,
         db_index=True,
     )
-    slug = models.SlugField(
-        max_length=1024,
-        db_index=True,
-    )
+    slug = models.SlugField(max_length=255)
     logo = models.ImageField(
         "logo",
         upload_to="center/",
         help_text=_(
             "Upload only image file with .png, .jpeg, .jpg extension. Recommended image size: W 240px * H 340px"
         ),
-        validators=[validate_bannner_extension],
+        validators=[validate_bannner_extension, ImageUploadValidator("logo")],
     )
     banner = models.ImageField(
         "Banner",
@@ -88,15 +95,21 @@ class Center(TimeStampedModel):
         null=True,
         upload_to="center/",
         help_text=_("Upload only image file with .png, .jpeg, .jpg extension."),
-        validators=[validate_bannner_extension],
+        validators=[validate_bannner_extension, ImageUploadValidator("banner")],
     )
     content = RichTextField("Description", null=True, blank=True)
+    # Rendered from content on save, see RenderedContentMixin
+    content_html = models.TextField(blank=True, default="", editable=False)
+    content_excerpt = models.TextField(blank=True, default="", editable=False)
+    content_word_count = models.PositiveIntegerField(default=0, editable=False)
+    content_first_image = models.CharField(max_length=1024, blank=True, default="", editable=False)
 
     def __str__(self):
         return self.name
 
     class Meta:
         app_label = "course_partnerships"
+        unique_together = ("partner", "slug")
         verbose_name = "Centers"
         verbose_name_plural = "Centers"
 
@@ -119,9 +132,29 @@ class Category(TimeStampedModel):
         verbose_name_plural = "Course Categories"
 
 
+# CourseOverview fields used by the course cards, besides the course id
+COURSE_CARD_FIELDS = (
+    "display_name",
+    "display_number_with_default",
+    "display_org_with_default",
+    "course_image_url",
+    "short_description",
+    "start",
+    "end",
+    "self_paced",
+)
+
+# CourseOverview fields copied into EnhancedCourse
+COURSE_SNAPSHOT_FIELDS = COURSE_CARD_FIELDS + ("language",)
+
+
 class EnhancedCourse(TimeStampedModel):
     """
     Model for store course releted extra details
+
+    The fields needed by course cards and catalog filters are copied from
+    CourseOverview when a course is published, so that listings read this
+    table alone. `snapshot_refreshed` is None until the first copy.
     """
 
     course = models.OneToOneField(
@@ -134,6 +167,17 @@ class EnhancedCourse(TimeStampedModel):
     center = models.ForeignKey(Center, null=True, blank=True, db_index=True, on_delete=models.SET(""))
     category = models.ForeignKey(Category, null=True, blank=True, db_index=True, on_delete=models.SET(""))
 
+    display_name = models.TextField(null=True, editable=False)
+    display_number_with_default = models.TextField(default="", editable=False)
+    display_org_with_default = models.TextField(default="", editable=False)
+    course_image_url = models.TextField(default="", editable=False)
+    short_description = models.TextField(null=True, editable=False)
+    start = models.DateTimeField(null=True, db_index=True, editable=False)
+    end = models.DateTimeField(null=True, editable=False)
+    self_paced = models.BooleanField(default=False, editable=False)
+    language = models.TextField(null=True, editable=False)
+    snapshot_refreshed = models.DateTimeField(null=True, editable=False)
+
     class Meta:
         app_label = "course_partnerships"
 
@@ -148,6 +192,220 @@ class EnhancedCourse(TimeStampedModel):
         course, created = cls.objects.get_or_create(course_id=course_id)
         course.save()
 
+    @staticmethod
+    def snapshot_q(lookup, value):
+        """
+        Return a Q object applying a lookup to a copied course field, e.g. `snapshot_q("start__gte", date)`.
+
+        Rows whose fields were not copied yet, such as every row right after
+        the migration adding them, are matched on CourseOverview instead.
+        """
+        return Q(snapshot_refreshed__isnull=False, **{lookup: value}) | Q(
+            snapshot_refreshed__isnull=True, **{f"course__{lookup}": value}
+        )
+
+    def as_course_overview(self):
+        """
+        Return an unsaved CourseOverview carrying the copied course card fields.
+
+        Templates written for CourseOverview objects can render it as is.
+        """
+        return CourseOverview(id=self.course_id, **{field: getattr(self, field) for field in COURSE_SNAPSHOT_FIELDS})
+
+    @classmethod
+    def refresh_snapshots(cls, course_ids):
+        """
+        Copy the course card fields of the given courses from CourseOverview with a single bulk update.
+
+        Returns the number of updated rows and the ids of their partners.
+        """
+        overviews = {
+            str(row.pop("id")): row
+            for row in CourseOverview.objects.filter(id__in=course_ids).values("id", *COURSE_SNAPSHOT_FIELDS)
+        }
+        now = timezone.now()
+        updated = []
+        partner_ids = set()
+        rows = cls.objects.filter(course_id__in=course_ids).values_list("id", "course_id", "partner_id")
+        for pk, course_id, partner_id in rows:
+            overview = overviews.get(str(course_id))
+            if overview is None:
+                continue
+            updated.append(cls(id=pk, snapshot_refreshed=now, **overview))
+            partner_ids.add(partner_id)
+        if updated:
+            cls.objects.bulk_update(updated, [*COURSE_SNAPSHOT_FIELDS, "snapshot_refreshed"])
+        return len(updated), partner_ids
+
+    @classmethod
+    def get_course_cards(cls, course_ids, as_values=False):
+        """
+        Return {course id string: course card} for the given courses.
+
+        Cards are read from the copied fields, falling back to CourseOverview
+        for courses without a copy yet. They are dictionaries with as_values,
+        and unsaved CourseOverview instances otherwise. Unknown courses are left out.
+        """
+        course_ids = list(course_ids)
+        rows = cls.objects.filter(course_id__in=course_ids, snapshot_refreshed__isnull=False).values(
+            "course_id", *COURSE_SNAPSHOT_FIELDS
+        )
+        cards = {str(row["course_id"]): row for row in rows}
+        missing = [course_id for course_id in course_ids if str(course_id) not in cards]
+        if missing:
+            overviews = CourseOverview.objects.filter(id__in=missing).values("id", *COURSE_SNAPSHOT_FIELDS)
+            for row in overviews:
+                row["course_id"] = row.pop("id")
+                cards[str(row["course_id"])] = row
+
+        for course_id, card in cards.items():
+            course_key = card.pop("course_id")
+            cards[course_id] = dict(card, id=course_id) if as_values else CourseOverview(id=course_key, **card)
+        return cards
+
+    @classmethod
+    def get_page(cls, partner, center=None, category=None, cursor=None, page_size=DEFAULT_PAGE_SIZE, as_values=False):
+        """
+        Return one page of the courses of a partner and the cursor of the next page.
+
+        Courses can be restricted to a center and/or a category, and come in a
+        stable order. The partner, center and category can be given as
+        instances or ids. Only the course fields needed by the course cards are
+        loaded. With as_values, items are flat dictionaries instead of
+        EnhancedCourse instances.
+        """
+        courses = cls.objects.filter(partner=partner)
+        if center is not None:
+            courses = courses.filter(center=center)
+        if category is not None:
+            courses = courses.filter(category=category)
+        return cls.paginate(courses, cursor=cursor, page_size=page_size, as_values=as_values)
+
+    @classmethod
+    def paginate(cls, courses, cursor=None, page_size=DEFAULT_PAGE_SIZE, as_values=False):
+        """
+        Return one page of an EnhancedCourse queryset, in id order, and the cursor of the next page.
+
+        Only the course fields needed by the course cards are loaded. Courses
+        whose fields were never copied get them from CourseOverview.
+        """
+        fields = ("id", "course_id", "center_id", "category_id", "snapshot_refreshed", *COURSE_SNAPSHOT_FIELDS)
+        courses = courses.values(*fields) if as_values else courses.only(*fields)
+        items, next_cursor = paginate_by_keyset(courses, ("id",), cursor=cursor, page_size=page_size)
+        cls.fill_stale_snapshots(items, as_values=as_values)
+        return items, next_cursor
+
+    @classmethod
+    def fill_stale_snapshots(cls, items, as_values=False):
+        """
+        Set the copied course fields of the given rows that were never copied from CourseOverview.
+
+        Items are EnhancedCourse instances, or dictionaries with as_values, loaded
+        with `course_id`, `snapshot_refreshed` and the copied fields. They are
+        updated in place.
+        """
+        stale = {}
+        for item in items:
+            if (item["snapshot_refreshed"] if as_values else item.snapshot_refreshed) is None:
+                stale[str(item["course_id"] if as_values else item.course_id)] = item
+        if stale:
+            overviews = CourseOverview.objects.filter(id__in=list(stale)).values("id", *COURSE_SNAPSHOT_FIELDS)
+            for overview in overviews:
+                item = stale[str(overview.pop("id"))]
+                if as_values:
+                    item.update(overview)
+                else:
+                    for field, value in overview.items():
+                        setattr(item, field, value)
+
+
+class PartnerCategoryCount(models.Model):
+    """
+    Denormalized number of courses per partner, center and category.
+
+    Rows are kept up to date incrementally from the EnhancedCourse signal
+    handlers and can be rebuilt from scratch with the
+    `rebuild_category_facets` management command.
+
+    `center_key` repeats the center id, or 0 for partner-level rows, so that
+    uniqueness is also enforced for the rows without a center: NULLs never
+    conflict in a unique index.
+    """
+
+    partner = models.ForeignKey(Partner, on_delete=models.CASCADE, related_name="category_counts")
+    center = models.ForeignKey(Center, null=True, blank=True, on_delete=models.CASCADE, related_name="category_counts")
+    center_key = models.PositiveIntegerField(default=0, editable=False)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="facet_counts")
+    course_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        app_label = "course_partnerships"
+        unique_together = ("partner", "center_key", "category")
+        verbose_name = "Partner Category Count"
+        verbose_name_plural = "Partner Category Counts"
+
+    def __str__(self):
+        return f"{self.partner_id}/{self.center_id}/{self.category_id}: {self.course_count}"
+
+    @classmethod
+    def adjust(cls, partner_id, center_id, category_id, delta):
+        """
+        Add delta to the course count of a (partner, center, category) row.
+
+        Courses without a partner or a category are not counted.
+        """
+        if not partner_id or not category_id or not delta:
+            return
+        lookup = {"partner_id": partner_id, "center_key": center_id or 0, "category_id": category_id}
+        rows = cls.objects.filter(**lookup)
+        if delta < 0:
+            rows.filter(course_count__gte=-delta).update(course_count=F("course_count") + delta)
+            return
+        if rows.update(course_count=F("course_count") + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(center_id=center_id, course_count=delta, **lookup)
+        except IntegrityError:
+            rows.update(course_count=F("course_count") + delta)
+
+    @classmethod
+    def rebuild(cls, partner_ids=None):
+        """
+        Recompute the counts from EnhancedCourse, for all partners or only the given ones.
+        """
+        courses = EnhancedCourse.objects.filter(partner__isnull=False, category__isnull=False)
+        counts = cls.objects.all()
+        if partner_ids is not None:
+            courses = courses.filter(partner_id__in=partner_ids)
+            counts = counts.filter(partner_id__in=partner_ids)
+
+        rows = [
+            cls(
+                partner_id=row["partner_id"],
+                center_id=row["center_id"],
+                center_key=row["center_id"] or 0,
+                category_id=row["category_id"],
+                course_count=row["course_count"],
+            )
+            for row in courses.values("partner_id", "center_id", "category_id").annotate(course_count=Count("id"))
+        ]
+        with transaction.atomic():
+            counts.delete()
+            cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    @classmethod
+    def get_categories(cls, partner, center=None):
+        """
+        Return the categories used by the courses of a partner, or of one of its
+        centers, annotated with their number of courses as `num_courses`.
+        """
+        lookup = {"facet_counts__partner": partner, "facet_counts__course_count__gt": 0}
+        if center is not None:
+            lookup["facet_counts__center"] = center
+        return Category.objects.filter(**lookup).annotate(num_courses=Sum("facet_counts__course_count"))
+
 
 class PartnerOrganizationMapping(TimeStampedModel):
     """
@@ -196,7 +454,7 @@ class PartnerOrganizationMapping(TimeStampedModel):
         verbose_name_plural = "Partner-Organization Mappings"
 
 
-class CourseCreator(TimeStampedModel):
+class CourseCreator(ImageDerivativesMixin, TimeStampedModel):
     """
     Model for storing course creator information.
 
@@ -240,7 +498,7 @@ class CourseCreator(TimeStampedModel):
         blank=True,
         null=True,
         help_text=_("Upload only image file with .png, .jpeg, .jpg extension."),
-        validators=[validate_bannner_extension],
+        validators=[validate_bannner_extension, ImageUploadValidator("profile_picture")],
     )
 
     def __str__(self):
@@ -249,3 +507,54 @@ class CourseCreator(TimeStampedModel):
     class Meta:
         verbose_name = "Course Creator"
         verbose_name_plural = "Course Creators"
+
+
+class SyncCheckpoint(TimeStampedModel):
+    """
+    High-water mark of an incremental synchronisation job.
+
+    Stores the latest source `modified` timestamp a job has processed, so that
+    its next run only looks at rows changed since then.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    high_water_mark = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.high_water_mark}"
+
+    class Meta:
+        app_label = "course_partnerships"
+        verbose_name = "Sync Checkpoint"
+        verbose_name_plural = "Sync Checkpoints"
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index entry: one term of a searchable object and its weight.
+
+    Rows are maintained by `course_partnerships.search`, from model signals
+    and the `rebuild_search_index` management command.
+    """
+
+    KIND_CHOICES = (
+        ("partner", "School/Partner"),
+        ("center", "Center"),
+        ("course_creator", "Course Creator"),
+        ("category", "Category"),
+    )
+
+    term = models.CharField(max_length=100)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    weight = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.term} ({self.kind} {self.object_id})"
+
+    class Meta:
+        app_label = "course_partnerships"
+        unique_together = ("term", "kind", "object_id")
+        indexes = [models.Index(fields=["kind", "object_id"], name="search_term_object_idx")]
+        verbose_name = "Search Term"
+        verbose_name_plural = "Search Terms"
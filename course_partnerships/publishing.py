@@ -0,0 +1,196 @@
+"""
+Deferred processing of course publish and delete events
+
+Studio sends course_published many times in a row for the same course. The
+signal handlers only record the course key; once the surrounding transaction
+commits, all recorded keys are coalesced into one batch and handed to the
+backend selected by the COURSE_PARTNERSHIPS_PUBLISH_BACKEND setting:
+
+    "celery"  process the batch in a celery worker (default)
+    "inline"  process the batch right away, in the committing thread
+    "local"   process the batch in a background thread of this process; batches
+              still queued are lost when the process exits, so this is only
+              meant for development
+"""
+
+import logging
+import queue
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .assignment import assign_partners
+from .cache import bump_facet_index_version, bump_partner_version
+from .models import EnhancedCourse
+from .snapshots import homepage_catalog
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PUBLISH_BACKEND = "celery"
+
+
+class CourseEventBatch:
+    """
+    Set of published and deleted course keys, where the latest event of a course wins.
+    """
+
+    def __init__(self, published=(), deleted=()):
+        self.published = set(published)
+        self.deleted = set(deleted)
+
+    def __bool__(self):
+        return bool(self.published or self.deleted)
+
+    def add(self, course_key, deleted=False):
+        if deleted:
+            self.published.discard(course_key)
+            self.deleted.add(course_key)
+        else:
+            self.deleted.discard(course_key)
+            self.published.add(course_key)
+
+    def merge(self, other):
+        for course_key in other.published:
+            self.add(course_key)
+        for course_key in other.deleted:
+            self.add(course_key, deleted=True)
+
+
+def process_course_events(published=(), deleted=()):
+    """
+    Apply a batch of course events to EnhancedCourse.
+
+    Missing EnhancedCourse rows of published courses are created in bulk,
+    their course card fields are copied from CourseOverview and mapped
+    partners are assigned with a single bulk update.
+    """
+    if deleted:
+        EnhancedCourse.objects.filter(course_id__in=deleted).delete()
+
+    if published:
+        published_courses = EnhancedCourse.objects.filter(course_id__in=published)
+        existing = {str(course_id) for course_id in published_courses.values_list("course_id", flat=True)}
+        missing = [EnhancedCourse(course_id=course_key) for course_key in published if str(course_key) not in existing]
+        if missing:
+            EnhancedCourse.objects.bulk_create(missing, ignore_conflicts=True)
+            bump_facet_index_version()
+        published_courses.update(modified=timezone.now())
+        EnhancedCourse.refresh_snapshots(published)
+        homepage_catalog.invalidate()
+        assign_partners(published_courses.filter(partner__isnull=True))
+        bump_partner_version(*published_courses.filter(partner__isnull=False).values_list("partner_id", flat=True))
+
+
+class LocalQueueWorker:
+    """
+    In-process queue of course event batches, consumed by a daemon thread.
+
+    Batches waiting in the queue are coalesced before being processed.
+    `drain` processes everything queued in the calling thread, which is what
+    tests and management commands should use.
+    """
+
+    def __init__(self, start_thread=True):
+        self.start_thread = start_thread
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, batch):
+        self._queue.put(batch)
+        if self.start_thread:
+            self._ensure_thread()
+
+    def drain(self):
+        batch = self._collect()
+        if batch:
+            process_course_events(batch.published, batch.deleted)
+
+    def _collect(self, block=False):
+        try:
+            batch = self._queue.get(block=block)
+        except queue.Empty:
+            return None
+        while True:
+            try:
+                batch.merge(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="course-partnerships-publish", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._collect(block=True)
+            close_old_connections()
+            try:
+                process_course_events(batch.published, batch.deleted)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception(
+                    "Could not process course events for %d published and %d deleted courses",
+                    len(batch.published),
+                    len(batch.deleted),
+                )
+            finally:
+                close_old_connections()
+
+
+local_worker = LocalQueueWorker()
+_pending = threading.local()
+
+
+def record_course_event(course_key, deleted=False):
+    """
+    Record a course event, to be dispatched once the current transaction commits.
+
+    The events of a transaction are collected in one batch, bound to the commit
+    callback that dispatches it. When the transaction, or the savepoint the
+    callback was registered in, is rolled back, Django drops the callback and
+    the batch goes with it.
+    """
+    callback = getattr(_pending, "callback", None)
+    if callback is not None and _is_pending(transaction.get_connection(), callback):
+        callback.args[0].add(course_key, deleted)
+        return
+    batch = CourseEventBatch()
+    batch.add(course_key, deleted)
+    _pending.callback = partial(dispatch_course_events, batch)
+    transaction.on_commit(_pending.callback)
+
+
+def _is_pending(connection, callback):
+    """
+    Return whether a commit callback is waiting for the current transaction, at the current savepoint.
+    """
+    savepoint_ids = set(connection.savepoint_ids)
+    return connection.in_atomic_block and any(
+        entry[1] is callback and entry[0] == savepoint_ids for entry in connection.run_on_commit
+    )
+
+
+def dispatch_course_events(batch):
+    """
+    Hand a batch of committed course events to the configured backend.
+    """
+    if not batch:
+        return
+
+    backend = getattr(settings, "COURSE_PARTNERSHIPS_PUBLISH_BACKEND", DEFAULT_PUBLISH_BACKEND)
+    if backend == "inline":
+        process_course_events(batch.published, batch.deleted)
+    elif backend == "celery":
+        from .tasks import process_course_events_task
+
+        process_course_events_task.delay(
+            [str(course_key) for course_key in batch.published],
+            [str(course_key) for course_key in batch.deleted],
+        )
+    else:
+        local_worker.submit(batch)
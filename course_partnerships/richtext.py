@@ -0,0 +1,201 @@
+"""
+Save-time rendering of RichTextField content
+
+Descriptions written in the ckeditor widget are sanitized once, when they are
+saved, and stored next to their source along with a plain text excerpt, a
+word count and the first image, so that pages and APIs read them as is.
+
+Sanitizing keeps an allowlist of tags and attributes, drops the content of
+script-like elements, only keeps http(s), mailto and relative URLs, and turns
+bare URLs in the text into links.
+"""
+
+import re
+from collections import namedtuple
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+EXCERPT_LENGTH = 300
+# Length of the content_first_image columns; longer image URLs are not used as the first image
+FIRST_IMAGE_MAX_LENGTH = 1024
+
+ALLOWED_TAGS = set(
+    "a b blockquote br code div em figcaption figure h1 h2 h3 h4 h5 h6 hr i img li ol p pre s span strong sub sup "
+    "table tbody td tfoot th thead tr u ul".split()
+)
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan"},
+}
+URL_ATTRIBUTES = {"href", "src"}
+ALLOWED_SCHEMES = {"", "http", "https", "mailto"}
+VOID_TAGS = {"br", "hr", "img"}
+DROPPED_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "template", "noscript", "textarea"}
+BLOCK_TAGS = set("blockquote br div figcaption figure h1 h2 h3 h4 h5 h6 hr li p pre td th tr".split())
+TSHEG = "\u0f0b"
+
+URL_RE = re.compile(r"\bhttps?://[^\s<>\"']+[^\s<>\"'.,;:!?)\]]")
+# Words are runs of characters between whitespace and Tibetan tsheg/shad marks,
+# so that Tibetan text, written without spaces, is counted by syllable.
+WORD_RE = re.compile(r"[^\s\u0f0b-\u0f14]+")
+
+RenderedContent = namedtuple("RenderedContent", ["html", "excerpt", "word_count", "first_image"])
+
+
+def is_safe_url(url):
+    try:
+        return urlsplit(url.strip()).scheme.lower() in ALLOWED_SCHEMES
+    except ValueError:
+        return False
+
+
+def format_attributes(attrs):
+    return "".join(f' {name}="{escape(value)}"' for name, value in attrs)
+
+
+class RichTextSanitizer(HTMLParser):
+    """
+    HTML parser writing out the sanitized markup and plain text of a document.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.first_image = ""
+        self._open_tags = []
+        self._dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping += 1
+            return
+        if self._dropping or tag not in ALLOWED_TAGS:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(" ")
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        kept = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not is_safe_url(value):
+                continue
+            kept.append((name, value))
+        if tag == "img":
+            src = dict(kept).get("src")
+            if not src:
+                return
+            if not self.first_image and len(src) <= FIRST_IMAGE_MAX_LENGTH:
+                self.first_image = src
+        if tag == "a":
+            kept.append(("rel", "nofollow noopener"))
+
+        self.html.append(f"<{tag}{format_attributes(kept)}>")
+        if tag not in VOID_TAGS:
+            self._open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping = max(0, self._dropping - 1)
+            return
+        if self._dropping or tag not in self._open_tags:
+            return
+        while self._open_tags:
+            open_tag = self._open_tags.pop()
+            self.html.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+        if tag in BLOCK_TAGS:
+            self.text.append(" ")
+
+    def handle_data(self, data):
+        if self._dropping:
+            return
+        self.text.append(data)
+        if "a" in self._open_tags:
+            self.html.append(escape(data))
+            return
+        position = 0
+        for match in URL_RE.finditer(data):
+            url = match.group()
+            self.html.append(escape(data[position : match.start()]))
+            self.html.append(f'<a href="{escape(url)}" rel="nofollow noopener">{escape(url)}</a>')
+            position = match.end()
+        self.html.append(escape(data[position:]))
+
+    def close(self):
+        super().close()
+        while self._open_tags:
+            self.html.append(f"</{self._open_tags.pop()}>")
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """
+    Return text cut at a word boundary to at most length characters, with an ellipsis if shortened.
+    """
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    boundary = max(cut.rfind(" "), cut.rfind(TSHEG))
+    if boundary > length // 2:
+        cut = cut[: boundary + 1 if cut[boundary] == TSHEG else boundary]
+    return f"{cut.rstrip()}…"
+
+
+def html_to_text(content):
+    """
+    Return the plain text of rich text content, with whitespace collapsed.
+    """
+    sanitizer = RichTextSanitizer()
+    sanitizer.feed(content or "")
+    sanitizer.close()
+    return " ".join("".join(sanitizer.text).split())
+
+
+def render_rich_text(content):
+    """
+    Return the sanitized HTML, excerpt, word count and first image URL of rich text content.
+    """
+    sanitizer = RichTextSanitizer()
+    sanitizer.feed(content or "")
+    sanitizer.close()
+    text = " ".join("".join(sanitizer.text).split())
+    return RenderedContent(
+        html="".join(sanitizer.html),
+        excerpt=make_excerpt(text),
+        word_count=len(WORD_RE.findall(text)),
+        first_image=sanitizer.first_image,
+    )
+
+
+class RenderedContentMixin:
+    """
+    Model mixin rendering the `content` rich text field into its `content_*` fields on save.
+    """
+
+    rendered_content_fields = ("content_html", "content_excerpt", "content_word_count", "content_first_image")
+
+    def render_content(self):
+        rendered = render_rich_text(self.content)
+        self.content_html = rendered.html
+        self.content_excerpt = rendered.excerpt
+        self.content_word_count = rendered.word_count
+        self.content_first_image = rendered.first_image
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.rendered_content_fields}
+        super().save(*args, **kwargs)
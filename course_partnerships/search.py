@@ -0,0 +1,214 @@
+"""
+Search over partners, centers, course creators and categories
+
+Searchable text is split into terms stored in the SearchTerm inverted index,
+with a weight per object that favours names over titles and descriptions.
+Every query term must match an indexed term, the last one as a prefix so that
+results follow the user while typing. Matching and ranking run in SQL, so only
+the requested page of results leaves the database.
+
+Tokens are runs of letters and digits, lowercased. Tibetan text is split into
+syllables on the tsheg and shad marks, since it is written without spaces.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+from django.urls import reverse
+
+from .models import Category, Center, CourseCreator, Partner, SearchTerm
+from .richtext import html_to_text
+
+MAX_TERM_LENGTH = 100
+# Queries shorter than this are rejected, and shorter last terms are only matched exactly
+MIN_QUERY_LENGTH = 2
+NAME_WEIGHT = 10
+TITLE_WEIGHT = 5
+TEXT_WEIGHT = 1
+
+# Tibetan digits, letters and marks, or any other letter or digit
+TOKEN_RE = re.compile(r"(?:[\u0f20-\u0f33\u0f40-\u0fbc]|[^\W_\u0f00-\u0fff])+")
+
+# Indexed fields and their weight, per kind of searchable object
+SEARCH_FIELDS = {
+    "partner": (("name", NAME_WEIGHT), ("content", TEXT_WEIGHT)),
+    "center": (("name", NAME_WEIGHT), ("content", TEXT_WEIGHT)),
+    "course_creator": (("name", NAME_WEIGHT), ("title", TITLE_WEIGHT), ("bio", TEXT_WEIGHT)),
+    "category": (("name", NAME_WEIGHT),),
+}
+RICH_TEXT_FIELDS = {"content"}
+SEARCH_MODELS = {
+    "partner": Partner,
+    "center": Center,
+    "course_creator": CourseCreator,
+    "category": Category,
+}
+
+
+def tokenize(text):
+    """
+    Return the search terms of a text, in order.
+    """
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(text)]
+
+
+def get_kind(instance):
+    """
+    Return the search kind of a model instance, or None if it is not searchable.
+    """
+    for kind, model in SEARCH_MODELS.items():
+        if isinstance(instance, model):
+            return kind
+    return None
+
+
+def get_term_weights(kind, instance):
+    """
+    Return {term: weight} for an object, summing the weights of every occurrence.
+    """
+    weights = Counter()
+    for field, weight in SEARCH_FIELDS[kind]:
+        text = getattr(instance, field) or ""
+        if field in RICH_TEXT_FIELDS:
+            text = html_to_text(text)
+        for term in tokenize(text):
+            weights[term] += weight
+    return weights
+
+
+def _build_terms(kind, instance):
+    return [
+        SearchTerm(term=term, kind=kind, object_id=instance.pk, weight=weight)
+        for term, weight in get_term_weights(kind, instance).items()
+    ]
+
+
+def index_object(instance):
+    """
+    Replace the indexed terms of a searchable object.
+    """
+    kind = get_kind(instance)
+    with transaction.atomic():
+        SearchTerm.objects.filter(kind=kind, object_id=instance.pk).delete()
+        SearchTerm.objects.bulk_create(_build_terms(kind, instance))
+
+
+def remove_object(kind, object_id):
+    """
+    Remove a searchable object from the index.
+    """
+    SearchTerm.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Rebuild the whole index in a single transaction and return {kind: number of indexed objects}.
+    """
+    indexed = {}
+    with transaction.atomic():
+        SearchTerm.objects.all().delete()
+        for kind, model in SEARCH_MODELS.items():
+            fields = [field for field, _ in SEARCH_FIELDS[kind]]
+            terms = []
+            indexed[kind] = 0
+            for instance in model.objects.only("id", *fields).iterator(chunk_size=batch_size):
+                terms.extend(_build_terms(kind, instance))
+                indexed[kind] += 1
+                if len(terms) >= batch_size:
+                    SearchTerm.objects.bulk_create(terms, batch_size=batch_size)
+                    terms = []
+            SearchTerm.objects.bulk_create(terms, batch_size=batch_size)
+    return indexed
+
+
+def search(query, kinds=None):
+    """
+    Return a queryset of the (kind, object_id, score) of the objects matching a query, best first.
+
+    An indexed term matching a query term exactly scores twice its weight, a
+    term merely starting with the last query term scores its weight. Each
+    query term counts with its best matching term. The last query term is only
+    matched as a prefix when it has at least MIN_QUERY_LENGTH characters.
+
+    The queryset is evaluated lazily: slice it to fetch a page, and count() it
+    for the number of results.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return SearchTerm.objects.none().values_list("kind", "object_id", "weight")
+
+    last = len(tokens) - 1
+    prefix = tokens[last] if len(tokens[last]) >= MIN_QUERY_LENGTH else None
+    condition = Q(term__in=set(tokens))
+    if prefix:
+        condition |= Q(term__startswith=prefix)
+    entries = SearchTerm.objects.filter(condition)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+
+    scores = {}
+    for index, token in enumerate(tokens):
+        cases = [When(term=token, then=F("weight") * 2)]
+        if index == last and prefix:
+            cases.append(When(term__startswith=prefix, then=F("weight")))
+        scores[f"score_{index}"] = Max(Case(*cases, default=Value(0), output_field=IntegerField()))
+
+    names = list(scores)
+    total = F(names[0])
+    for name in names[1:]:
+        total = total + F(name)
+    return (
+        entries.values("kind", "object_id")
+        .annotate(**scores)
+        .filter(**{f"{name}__gt": 0 for name in scores})
+        .annotate(score=total)
+        .order_by("-score", "kind", "object_id")
+        .values_list("kind", "object_id", "score")
+    )
+
+
+def get_search_results(ranked):
+    """
+    Return the display data of ranked (kind, object_id, score) search results, in the same order.
+
+    Objects deleted since they were ranked are left out.
+    """
+    ids = defaultdict(list)
+    for kind, object_id, _ in ranked:
+        ids[kind].append(object_id)
+
+    data = {}
+    for partner in Partner.objects.filter(id__in=ids["partner"]).values("id", "name", "slug", "content_excerpt"):
+        data[("partner", partner["id"])] = {
+            "name": partner["name"],
+            "description": partner["content_excerpt"],
+            "url": reverse("course_partnerships:partner-detail", args=[partner["slug"]]),
+        }
+    centers = Center.objects.filter(id__in=ids["center"]).values(
+        "id", "name", "slug", "partner__slug", "content_excerpt"
+    )
+    for center in centers:
+        data[("center", center["id"])] = {
+            "name": center["name"],
+            "description": center["content_excerpt"],
+            "url": reverse("course_partnerships:center-detail", args=[center["partner__slug"], center["slug"]]),
+        }
+    creators = CourseCreator.objects.filter(id__in=ids["course_creator"]).values("id", "name", "title", "partner__slug")
+    for creator in creators:
+        data[("course_creator", creator["id"])] = {
+            "name": creator["name"],
+            "description": creator["title"] or "",
+            "url": reverse("course_partnerships:partner-detail", args=[creator["partner__slug"]]),
+        }
+    for category in Category.objects.filter(id__in=ids["category"]).values("id", "name"):
+        data[("category", category["id"])] = {"name": category["name"], "description": "", "url": None}
+
+    return [
+        {"type": kind, "id": object_id, "score": score, **data[(kind, object_id)]}
+        for kind, object_id, score in ranked
+        if (kind, object_id) in data
+    ]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from course_partnerships.models import PartnerOrganizationMapping
+from course_partnerships.images import get_derivatives
+from course_partnerships.models import COURSE_CARD_FIELDS, Partner, PartnerOrganizationMapping
 
 
 class PartnerOrganizationMappingSerializer(serializers.ModelSerializer):
@@ -10,16 +11,18 @@ class PartnerOrganizationMappingSerializer(serializers.ModelSerializer):
     Serializes:
         - partner_name (str): Display name if provided, otherwise default partner name
         - logo (str): Fully-qualified URL to the partner's logo
+        - logo_derivatives (list): Resized variants of the logo, as width/format/URL dicts
         - organization (str): The short_name of the associated organization
     """
 
     partner_name = serializers.SerializerMethodField()
     logo = serializers.SerializerMethodField()
+    logo_derivatives = serializers.SerializerMethodField()
     organization = serializers.CharField(source="organization.short_name")
 
     class Meta:
         model = PartnerOrganizationMapping
-        fields = ["partner_name", "logo", "organization"]
+        fields = ["partner_name", "logo", "logo_derivatives", "organization"]
 
     def get_partner_name(self, obj):
         """
@@ -47,3 +50,88 @@ class PartnerOrganizationMappingSerializer(serializers.ModelSerializer):
         if obj.partner.logo and hasattr(obj.partner.logo, "url"):
             return request.build_absolute_uri(obj.partner.logo.url)
         return None
+
+    def get_logo_derivatives(self, obj):
+        """
+        Returns the resized variants of the partner's logo, with fully-qualified URLs.
+
+        Args:
+            obj (PartnerOrganizationMapping): Mapping instance
+
+        Returns:
+            list: {"width", "format", "url"} dicts, empty if there is no logo
+        """
+        request = self.context.get("request")
+        return [
+            dict(derivative, url=request.build_absolute_uri(derivative["url"]))
+            for derivative in get_derivatives(obj.partner.logo)
+        ]
+
+
+def serialize_partner_logo(logo, request):
+    """
+    Return the absolute URL and derivatives of a partner logo read with values(), or (None, []).
+
+    Args:
+        logo (str): Storage name of the logo, as stored in the `logo` column
+        request (HttpRequest): Request used to build absolute URLs
+
+    Returns:
+        tuple: Logo URL and list of {"width", "format", "url"} dicts
+    """
+    if not logo:
+        return None, []
+    logo_field = Partner._meta.get_field("logo")
+    field_file = logo_field.attr_class(None, logo_field, logo)
+    derivatives = [
+        dict(derivative, url=request.build_absolute_uri(derivative["url"]))
+        for derivative in get_derivatives(field_file)
+    ]
+    return request.build_absolute_uri(field_file.url), derivatives
+
+
+def serialize_partner_mappings(mappings, request):
+    """
+    Fast path producing the same output as PartnerOrganizationMappingSerializer(mappings, many=True).
+
+    Rows are read as flat tuples joined across partner and organization, and
+    each distinct logo is resolved to an absolute URL only once.
+
+    Args:
+        mappings (QuerySet): PartnerOrganizationMapping queryset
+        request (HttpRequest): Request used to build absolute logo URLs
+
+    Returns:
+        list: Serialized mappings
+    """
+    rows = mappings.values_list("display_name", "partner__name", "partner__logo", "organization__short_name")
+    logos = {}
+    data = []
+    for display_name, partner_name, logo, organization in rows:
+        if logo not in logos:
+            logos[logo] = serialize_partner_logo(logo, request)
+        logo_url, logo_derivatives = logos[logo]
+        data.append(
+            {
+                "partner_name": display_name or partner_name,
+                "logo": logo_url,
+                "logo_derivatives": logo_derivatives,
+                "organization": organization,
+            }
+        )
+    return data
+
+
+def serialize_course_cards(courses):
+    """
+    Serialize EnhancedCourse rows read with `EnhancedCourse.paginate(..., as_values=True)`.
+
+    Args:
+        courses (list): Flat dictionaries of EnhancedCourse fields
+
+    Returns:
+        list: Dictionaries of the course id and course card fields
+    """
+    return [
+        {"id": str(course["course_id"]), **{field: course[field] for field in COURSE_CARD_FIELDS}} for course in courses
+    ]
@@ -3,14 +3,34 @@
 """
 
 import logging
+from functools import partial
 
+from django.db import transaction
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from organizations.models import Organization
 from xmodule.modulestore.django import SignalHandler
-from organizations.models import OrganizationCourse
-from ..models import PartnerOrganizationMapping
 
-from ..models import EnhancedCourse
+from ..cache import (
+    bump_facet_index_version,
+    bump_organization_partners_version,
+    bump_partner_version,
+    bump_slugs_version,
+)
+from ..facets import facet_index
+from ..images import IMAGE_FIELDS, schedule_derivatives
+from ..models import (
+    Category,
+    Center,
+    CourseCreator,
+    EnhancedCourse,
+    Partner,
+    PartnerCategoryCount,
+    PartnerOrganizationMapping,
+)
+from ..publishing import record_course_event
+from ..search import get_kind, index_object, remove_object
+from ..snapshots import homepage_catalog, partner_directory
 
 log = logging.getLogger(__name__)
 
@@ -18,29 +38,215 @@ log = logging.getLogger(__name__)
 @receiver(SignalHandler.course_published)
 def course_publish_signal_handler(sender, course_key, **kwargs):
     """
-    Receives course publishing signal and creates/updates EnhancedCourse with partner
+    Receives course publishing signal and schedules the creation/update of
+    EnhancedCourse with partner once the publish is committed
     """
-    course, created = EnhancedCourse.objects.get_or_create(course_id=course_key)
-
-    # Try to auto-assign partner based on organization
-    if not course.partner:
-        try:
-            # Get organization for this course
-            org_course = OrganizationCourse.objects.filter(course_id=str(course_key)).first()
-            if org_course:
-                # Find partner mapping for this organization
-                mapping = PartnerOrganizationMapping.objects.filter(organization=org_course.organization).first()
-                if mapping:
-                    course.partner = mapping.partner
-                    course.save()
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            log.warning("Could not auto-assign partner to course %s: %s", course_key, e)
+    record_course_event(course_key)
 
 
 @receiver(SignalHandler.course_deleted)
 def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
     Catches the signal that a course has been deleted from Studio and
-    invalidates the corresponding Course cache entry if one exists.
+    schedules the deletion of the corresponding EnhancedCourse if one exists.
+    """
+    record_course_event(course_key, deleted=True)
+
+
+@receiver(pre_save, sender=EnhancedCourse)
+def remember_enhanced_course_assignment(sender, instance, **kwargs):
+    """
+    Keep the partner, center and category a course had before saving, so that
+    derived data of the previous assignment can be updated as well.
+    """
+    instance._previous_assignment = None
+    if instance.pk:
+        instance._previous_assignment = (
+            EnhancedCourse.objects.filter(pk=instance.pk).values_list("partner_id", "center_id", "category_id").first()
+        )
+
+
+@receiver(post_save, sender=Partner)
+@receiver(post_delete, sender=Partner)
+def invalidate_partner_page(sender, instance, **kwargs):
+    """
+    Invalidate the cached page of a partner once a change to the partner itself is committed.
+
+    Bumping before the commit would let a concurrent request cache the old
+    rows under the new version.
+    """
+    partner_id = instance.pk
+    transaction.on_commit(lambda: bump_partner_version(partner_id))
+
+
+@receiver(post_save, sender=Partner)
+@receiver(post_delete, sender=Partner)
+@receiver(post_save, sender=Center)
+@receiver(post_delete, sender=Center)
+def invalidate_slugs(sender, instance, **kwargs):
+    """
+    Empty the slug lookup cache of every process once a partner or center change is committed.
+    """
+    transaction.on_commit(bump_slugs_version)
+
+
+@receiver(post_save, sender=Center)
+@receiver(post_delete, sender=Center)
+@receiver(post_save, sender=CourseCreator)
+@receiver(post_delete, sender=CourseCreator)
+def invalidate_partner_page_for_related(sender, instance, **kwargs):
+    """
+    Invalidate the cached page of the partner a center or course creator belongs to once committed.
+    """
+    partner_id = instance.partner_id
+    transaction.on_commit(lambda: bump_partner_version(partner_id))
+
+
+@receiver(post_save, sender=EnhancedCourse)
+@receiver(post_delete, sender=EnhancedCourse)
+def invalidate_partner_page_for_course(sender, instance, **kwargs):
+    """
+    Invalidate the cached pages of the partners a course is, or was, assigned to once committed.
+    """
+    previous = getattr(instance, "_previous_assignment", None) or (None, None, None)
+    partner_ids = (instance.partner_id, previous[0])
+    transaction.on_commit(lambda: bump_partner_version(*partner_ids))
+
+
+@receiver(post_save, sender=EnhancedCourse)
+def update_category_counts_on_save(sender, instance, created, **kwargs):
+    """
+    Move a course between category counts when its assignment changes.
+    """
+    current = (instance.partner_id, instance.center_id, instance.category_id)
+    previous = None if created else getattr(instance, "_previous_assignment", None)
+    if previous == current:
+        return
+    if previous:
+        PartnerCategoryCount.adjust(*previous, -1)
+    PartnerCategoryCount.adjust(*current, 1)
+
+
+@receiver(post_delete, sender=EnhancedCourse)
+def update_category_counts_on_delete(sender, instance, **kwargs):
+    """
+    Remove a deleted course from its category count.
+    """
+    PartnerCategoryCount.adjust(instance.partner_id, instance.center_id, instance.category_id, -1)
+
+
+@receiver(post_save, sender=EnhancedCourse)
+@receiver(post_delete, sender=EnhancedCourse)
+def update_facet_index(sender, instance, created=False, **kwargs):
+    """
+    Move a course between facets of the in-process facet index once committed.
+    """
+    pk = instance.pk
+    if kwargs["signal"] is post_delete:
+        previous, current = (instance.partner_id, instance.center_id, instance.category_id), None
+    else:
+        previous = None if created else getattr(instance, "_previous_assignment", None)
+        current = (instance.partner_id, instance.center_id, instance.category_id)
+    transaction.on_commit(lambda: facet_index.update(pk, previous, current))
+
+
+@receiver(post_delete, sender=Partner)
+@receiver(post_delete, sender=Center)
+@receiver(post_delete, sender=Category)
+def invalidate_facet_index(sender, instance, **kwargs):
+    """
+    Rebuild the facet index once courses are detached from a deleted partner, center or category.
+
+    Courses are detached with a bulk update, which sends no EnhancedCourse signal.
+    """
+    transaction.on_commit(bump_facet_index_version)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_partner_page_for_category(sender, instance, **kwargs):
+    """
+    Invalidate the cached pages of every partner showing a category.
+
+    Categories are not necessarily owned by a partner, so the partners whose
+    courses use the category are invalidated as well. Deletion is handled before
+    the fact, while those courses still point at the category, and the versions
+    are bumped once the change is committed.
+    """
+    partner_ids = set(
+        EnhancedCourse.objects.filter(category_id=instance.pk, partner__isnull=False)
+        .values_list("partner_id", flat=True)
+        .distinct()
+    )
+    partner_ids.add(instance.partner_id)
+    transaction.on_commit(lambda: bump_partner_version(*partner_ids))
+
+
+@receiver(post_save, sender=PartnerOrganizationMapping)
+@receiver(post_delete, sender=PartnerOrganizationMapping)
+def invalidate_organization_partners(sender, instance, **kwargs):
+    """
+    Make every process reload its organization to partner map once the change is committed.
+    """
+    transaction.on_commit(bump_organization_partners_version)
+
+
+@receiver(post_save, sender=PartnerOrganizationMapping)
+@receiver(post_delete, sender=PartnerOrganizationMapping)
+@receiver(post_save, sender=Partner)
+@receiver(post_delete, sender=Partner)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_partner_directory(sender, instance, **kwargs):
+    """
+    Rebuild the mobile partner directory on its next request once the change is committed.
+    """
+    transaction.on_commit(partner_directory.invalidate)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=EnhancedCourse)
+@receiver(post_delete, sender=EnhancedCourse)
+@receiver(post_save, sender=Partner)
+@receiver(post_delete, sender=Partner)
+def invalidate_homepage_catalog(sender, instance, **kwargs):
+    """
+    Rebuild the homepage category rail on its next request once the change is committed.
+    """
+    transaction.on_commit(homepage_catalog.invalidate)
+
+
+@receiver(post_save, sender=Partner)
+@receiver(post_save, sender=Center)
+@receiver(post_save, sender=CourseCreator)
+def generate_image_derivatives(sender, instance, **kwargs):
+    """
+    Generate the missing responsive derivatives of the saved images in a celery worker once committed.
+    """
+    for field_name in IMAGE_FIELDS[sender.__name__]:
+        if getattr(instance, field_name):
+            transaction.on_commit(partial(schedule_derivatives, sender.__name__, instance.pk, field_name))
+
+
+@receiver(post_save, sender=Partner)
+@receiver(post_save, sender=Center)
+@receiver(post_save, sender=CourseCreator)
+@receiver(post_save, sender=Category)
+def update_search_index(sender, instance, **kwargs):
+    """
+    Index the terms of a saved searchable object once committed.
+    """
+    transaction.on_commit(lambda: index_object(instance))
+
+
+@receiver(post_delete, sender=Partner)
+@receiver(post_delete, sender=Center)
+@receiver(post_delete, sender=CourseCreator)
+@receiver(post_delete, sender=Category)
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Remove a deleted searchable object from the search index once committed.
     """
-    EnhancedCourse.objects.filter(course_id=course_key).delete()
+    kind, object_id = get_kind(instance), instance.pk
+    transaction.on_commit(lambda: remove_object(kind, object_id))
@@ -0,0 +1,67 @@
+"""
+Slug lookups for the partner and center routes
+
+Every school and center page starts by resolving its slugs. Each process keeps
+the (id, modified) of the most recently used slugs in a bounded LRU cache, and
+only checks a version number kept in the shared cache before using it. Saving
+or deleting a partner or center bumps the version, which empties every cache.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .cache import get_slugs_version
+from .models import Center, Partner
+
+SLUG_CACHE_SIZE = 1024
+
+
+class SlugCache:
+    """
+    Process-local LRU cache of partner and center slugs to (id, modified).
+
+    Unknown slugs are not cached and raise the DoesNotExist of their model.
+    """
+
+    def __init__(self, maxsize=None):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = OrderedDict()
+        self.maxsize = maxsize
+
+    def get_partner(self, slug):
+        """
+        Return the (id, modified) of the partner with the given slug.
+        """
+        return self._lookup(("partner", slug), Partner.objects.filter(slug=slug))
+
+    def get_center(self, partner_id, slug):
+        """
+        Return the (id, modified) of the center of a partner with the given slug.
+        """
+        return self._lookup(("center", partner_id, slug), Center.objects.filter(partner_id=partner_id, slug=slug))
+
+    def _lookup(self, key, queryset):
+        version = get_slugs_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = queryset.values_list("id", "modified").get()
+        maxsize = self.maxsize or getattr(settings, "COURSE_PARTNERSHIPS_SLUG_CACHE_SIZE", SLUG_CACHE_SIZE)
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = entry
+                while len(self._entries) > maxsize:
+                    self._entries.popitem(last=False)
+        return entry
+
+
+slug_cache = SlugCache()
@@ -0,0 +1,140 @@
+"""
+Precomputed API payloads served with conditional GET support
+
+A snapshot is the payload of a read-mostly endpoint, built once per version
+and kept in the shared cache together with its ETag and build time. Serving
+a snapshot, or answering a conditional request with 304, only costs cache
+reads.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.functions import Coalesce
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import bump_snapshot_version, get_snapshot_version
+from .models import COURSE_SNAPSHOT_FIELDS, Category, EnhancedCourse, Partner, PartnerOrganizationMapping
+from .serializers import serialize_course_cards, serialize_partner_logo, serialize_partner_mappings
+
+SNAPSHOT_KEY = "course_partnerships.snapshot.{name}.{variant}.v{version}"
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+HOMEPAGE_COURSES_PER_CATEGORY = 8
+
+
+class Snapshot:
+    """
+    Named, versioned payload built by `build(request)`.
+
+    Payloads usually contain absolute URLs, so one variant is kept per scheme
+    and host.
+    """
+
+    def __init__(self, name, build):
+        self.name = name
+        self.build = build
+
+    def get(self, request):
+        """
+        Return the current snapshot as a dict with `data`, `etag` and `last_modified` keys.
+        """
+        variant = hashlib.md5(f"{request.scheme}://{request.get_host()}".encode()).hexdigest()
+        key = SNAPSHOT_KEY.format(name=self.name, variant=variant, version=get_snapshot_version(self.name))
+        snapshot = cache.get(key)
+        if snapshot is None:
+            data = self.build(request)
+            content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+            snapshot = {
+                "data": data,
+                "etag": f'"{hashlib.sha256(content).hexdigest()}"',
+                "last_modified": int(time.time()),
+            }
+            cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+        return snapshot
+
+    def invalidate(self):
+        bump_snapshot_version(self.name)
+
+    def response(self, request):
+        """
+        Return the snapshot as a DRF response, or a 304 if the client already has it.
+        """
+        snapshot = self.get(request)
+        headers = {"ETag": snapshot["etag"], "Last-Modified": http_date(snapshot["last_modified"])}
+        if is_not_modified(request, snapshot):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(snapshot["data"], headers=headers)
+
+
+def is_not_modified(request, snapshot):
+    """
+    Return whether the validators sent by the client match the snapshot.
+
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 7232.
+    """
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        etags = {etag.strip() for etag in if_none_match.split(",")}
+        return "*" in etags or snapshot["etag"] in etags or f"W/{snapshot['etag']}" in etags
+
+    if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return if_modified_since is not None and snapshot["last_modified"] <= if_modified_since
+
+
+def build_partner_directory(request):
+    """
+    Return the serialized partner-organization mappings shown in the mobile app.
+    """
+    mappings = PartnerOrganizationMapping.objects.filter(show_in_mobile_app=True).order_by("id")
+    return serialize_partner_mappings(mappings, request)
+
+
+partner_directory = Snapshot("partner_directory", build_partner_directory)
+
+
+def build_homepage_catalog(request):
+    """
+    Return the categories shown on the homepage with their latest courses, and the partners of those courses.
+
+    Courses are read from the card fields copied into EnhancedCourse, most
+    recent start first, with one limited query per category. Courses whose
+    fields were never copied are ranked and shown from CourseOverview.
+    """
+    limit = getattr(settings, "COURSE_PARTNERSHIPS_HOMEPAGE_COURSES_PER_CATEGORY", HOMEPAGE_COURSES_PER_CATEGORY)
+    categories = list(Category.objects.filter(show_on_homepage=True).order_by("name", "id").values("id", "name"))
+
+    courses_by_category = {}
+    partner_ids = set()
+    for category in categories:
+        courses = list(
+            EnhancedCourse.objects.filter(category_id=category["id"])
+            .order_by(Coalesce("start", "course__start").desc(nulls_last=True), "-id")
+            .values("course_id", "partner_id", "snapshot_refreshed", *COURSE_SNAPSHOT_FIELDS)[:limit]
+        )
+        EnhancedCourse.fill_stale_snapshots(courses, as_values=True)
+        cards = serialize_course_cards(courses)
+        for card, course in zip(cards, courses):
+            card["partner"] = course["partner_id"]
+            if course["partner_id"]:
+                partner_ids.add(course["partner_id"])
+        courses_by_category[category["id"]] = cards
+
+    partners = []
+    rows = Partner.objects.filter(id__in=partner_ids).order_by("name", "id").values("id", "name", "slug", "logo")
+    for partner in rows:
+        logo, logo_derivatives = serialize_partner_logo(partner["logo"], request)
+        partners.append(dict(partner, logo=logo, logo_derivatives=logo_derivatives))
+
+    return {
+        "categories": [dict(category, courses=courses_by_category[category["id"]]) for category in categories],
+        "partners": partners,
+    }
+
+
+homepage_catalog = Snapshot("homepage_catalog", build_homepage_catalog)
@@ -0,0 +1,31 @@
+"""
+Celery tasks for course_partnerships
+"""
+
+from celery import shared_task
+from django.apps import apps
+from opaque_keys.edx.keys import CourseKey
+
+from .images import generate_derivatives
+from .publishing import process_course_events
+
+
+@shared_task
+def process_course_events_task(published, deleted):
+    """
+    Apply a batch of course publish and delete events, given as course key strings.
+    """
+    process_course_events(
+        [CourseKey.from_string(course_id) for course_id in published],
+        [CourseKey.from_string(course_id) for course_id in deleted],
+    )
+
+
+@shared_task
+def generate_image_derivatives_task(model_name, pk, field_name):
+    """
+    Render and store the missing derivatives of an image field of a partner, center or course creator.
+    """
+    instance = apps.get_model("course_partnerships", model_name).objects.filter(pk=pk).first()
+    if instance is not None:
+        generate_derivatives(getattr(instance, field_name))
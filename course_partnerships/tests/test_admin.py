@@ -0,0 +1,92 @@
+"""
+Tests for the bulk assignment actions of the EnhancedCourse admin
+"""
+
+from unittest import mock
+
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from course_partnerships.admin import EnhancedCourseAdmin
+from course_partnerships.models import Category, Center, EnhancedCourse, Partner, PartnerCategoryCount
+
+
+@mock.patch("course_partnerships.assignment.homepage_catalog")
+@mock.patch("course_partnerships.assignment.bump_facet_index_version")
+class EnhancedCourseAdminActionsTest(TestCase):
+    """
+    Tests for the assign_partner, assign_center and assign_category actions.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.model_admin = EnhancedCourseAdmin(EnhancedCourse, admin.site)
+        self.model_admin.message_user = mock.Mock()
+        self.sherab = Partner.objects.create(name="Sherab", slug="sherab")
+        self.dharma = Partner.objects.create(name="Dharma School", slug="dharma")
+        self.sherab_center = Center.objects.create(partner=self.sherab, name="Sherab Ling", slug="sherab-ling")
+        self.dharma_center = Center.objects.create(partner=self.dharma, name="Dharma Hall", slug="dharma-hall")
+        self.category = Category.objects.create(name="Philosophy")
+        self.courses = [
+            EnhancedCourse.objects.create(course_id=CourseKey.from_string(f"course-v1:edX+{number}+2024"))
+            for number in ("A", "B", "C")
+        ]
+
+    def run_action(self, action, **data):
+        request = RequestFactory().post("/admin/course_partnerships/enhancedcourse/", data)
+        getattr(self.model_admin, action)(request, EnhancedCourse.objects.all())
+
+    def assignments(self):
+        return list(EnhancedCourse.objects.order_by("id").values_list("partner_id", "center_id", "category_id"))
+
+    def test_assign_partner_clears_the_previous_partners_center(self, bump_facet_index_version, homepage_catalog):
+        EnhancedCourse.objects.filter(pk=self.courses[0].pk).update(
+            partner_id=self.sherab.id, center_id=self.sherab_center.id
+        )
+        EnhancedCourse.objects.filter(pk=self.courses[1].pk).update(
+            partner_id=self.dharma.id, center_id=self.dharma_center.id
+        )
+
+        self.run_action("assign_partner", partner=self.sherab.id)
+
+        self.assertEqual(
+            self.assignments(),
+            [
+                (self.sherab.id, self.sherab_center.id, None),
+                (self.sherab.id, None, None),
+                (self.sherab.id, None, None),
+            ],
+        )
+        self.model_admin.message_user.assert_called_once_with(mock.ANY, "Updated 2 courses.", mock.ANY)
+
+    def test_assign_center_sets_its_partner(self, bump_facet_index_version, homepage_catalog):
+        EnhancedCourse.objects.filter(pk=self.courses[0].pk).update(partner_id=self.sherab.id)
+
+        self.run_action("assign_center", center=self.dharma_center.id)
+
+        self.assertEqual(self.assignments(), [(self.dharma.id, self.dharma_center.id, None)] * 3)
+        bump_facet_index_version.assert_called_once_with()
+        homepage_catalog.invalidate.assert_called_once_with()
+
+    def test_assign_category_refreshes_the_category_counts(self, bump_facet_index_version, homepage_catalog):
+        EnhancedCourse.objects.filter(pk__in=[self.courses[0].pk, self.courses[1].pk]).update(partner_id=self.sherab.id)
+
+        self.run_action("assign_category", category=self.category.id)
+
+        counts = PartnerCategoryCount.objects.values_list("partner_id", "center_id", "category_id", "course_count")
+        self.assertEqual(list(counts), [(self.sherab.id, None, self.category.id, 2)])
+
+    def test_assign_category_to_courses_without_partner(self, bump_facet_index_version, homepage_catalog):
+        self.run_action("assign_category", category=self.category.id)
+
+        self.assertEqual(self.assignments(), [(None, None, self.category.id)] * 3)
+        bump_facet_index_version.assert_called_once_with()
+        homepage_catalog.invalidate.assert_called_once_with()
+
+    def test_missing_choice_changes_nothing(self, bump_facet_index_version, homepage_catalog):
+        self.run_action("assign_partner")
+
+        self.assertEqual(self.assignments(), [(None, None, None)] * 3)
+        bump_facet_index_version.assert_not_called()
+        self.model_admin.message_user.assert_called_once_with(mock.ANY, "Select a partner to assign.", mock.ANY)
@@ -0,0 +1,43 @@
+"""
+Tests for the set-based partner assignment
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+
+from course_partnerships.assignment import refresh_partner_data
+
+
+@mock.patch("course_partnerships.assignment.PartnerCategoryCount")
+@mock.patch("course_partnerships.assignment.bump_partner_version")
+@mock.patch("course_partnerships.assignment.homepage_catalog")
+@mock.patch("course_partnerships.assignment.bump_facet_index_version")
+class RefreshPartnerDataTest(TestCase):
+    """
+    Tests for refresh_partner_data.
+    """
+
+    def test_nothing_changed(self, bump_facet_index_version, homepage_catalog, bump_partner_version, counts):
+        refresh_partner_data(set())
+
+        bump_facet_index_version.assert_not_called()
+        homepage_catalog.invalidate.assert_not_called()
+        bump_partner_version.assert_not_called()
+        counts.rebuild.assert_not_called()
+
+    def test_courses_without_partner(self, bump_facet_index_version, homepage_catalog, bump_partner_version, counts):
+        refresh_partner_data({None})
+
+        bump_facet_index_version.assert_called_once_with()
+        homepage_catalog.invalidate.assert_called_once_with()
+        bump_partner_version.assert_not_called()
+        counts.rebuild.assert_not_called()
+
+    def test_partners(self, bump_facet_index_version, homepage_catalog, bump_partner_version, counts):
+        refresh_partner_data([None, 1, 2])
+
+        bump_facet_index_version.assert_called_once_with()
+        homepage_catalog.invalidate.assert_called_once_with()
+        bump_partner_version.assert_called_once_with(1, 2)
+        counts.rebuild.assert_called_once_with({1, 2})
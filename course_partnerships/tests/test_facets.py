@@ -0,0 +1,88 @@
+"""
+Tests for the in-process facet index
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from course_partnerships.facets import FacetIndex, _popcount_bytes, popcount, to_bitmap
+from course_partnerships.models import Category, Center, EnhancedCourse, Partner
+
+
+class PopcountTest(TestCase):
+    """
+    Tests for popcount and its fallback.
+    """
+
+    def test_popcount(self):
+        for ids in ([], [0], [1, 7, 8, 9], [3, 1000, 70000], range(0, 5000, 3)):
+            bitmap = to_bitmap(ids)
+            self.assertEqual(popcount(bitmap), len(ids))
+            self.assertEqual(_popcount_bytes(bitmap), len(ids))
+
+
+@mock.patch("course_partnerships.facets.bump_facet_index_version", mock.Mock(return_value=2))
+@mock.patch("course_partnerships.facets.get_facet_index_version", mock.Mock(return_value=1))
+class FacetIndexTest(TestCase):
+    """
+    Tests for FacetIndex.get_facets.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.sherab = Partner.objects.create(name="Sherab", slug="sherab")
+        self.dharma = Partner.objects.create(name="Dharma School", slug="dharma")
+        self.sherab_center = Center.objects.create(partner=self.sherab, name="Sherab Ling", slug="sherab-ling")
+        self.dharma_center = Center.objects.create(partner=self.dharma, name="Dharma Hall", slug="dharma-hall")
+        self.philosophy = Category.objects.create(name="Philosophy")
+        self.language = Category.objects.create(name="Language")
+        assignments = [
+            (self.sherab, self.sherab_center, self.philosophy),
+            (self.sherab, None, self.language),
+            (self.sherab, self.sherab_center, self.language),
+            (self.dharma, self.dharma_center, self.philosophy),
+        ]
+        self.courses = []
+        for number, (partner, center, category) in enumerate(assignments):
+            course = EnhancedCourse.objects.create(course_id=CourseKey.from_string(f"course-v1:edX+C{number}+2024"))
+            EnhancedCourse.objects.filter(pk=course.pk).update(partner=partner, center=center, category=category)
+            self.courses.append(course)
+        self.index = FacetIndex()
+
+    def test_partner_facets_only_count_the_partners_values(self):
+        facets = self.index.get_facets(self.sherab.id)
+
+        self.assertEqual(facets["count"], 3)
+        self.assertEqual(facets["centers"], {self.sherab_center.id: 2})
+        self.assertEqual(facets["categories"], {self.philosophy.id: 1, self.language.id: 2})
+
+    def test_selected_values_filter_the_other_facet(self):
+        facets = self.index.get_facets(self.sherab.id, center_ids=[self.sherab_center.id])
+
+        self.assertEqual(facets["count"], 2)
+        self.assertEqual(facets["centers"], {self.sherab_center.id: 2})
+        self.assertEqual(facets["categories"], {self.philosophy.id: 1, self.language.id: 1})
+
+    def test_facets_of_every_partner(self):
+        facets = self.index.get_facets()
+
+        self.assertEqual(facets["count"], 4)
+        self.assertEqual(facets["centers"], {self.sherab_center.id: 2, self.dharma_center.id: 1})
+        self.assertEqual(facets["categories"], {self.philosophy.id: 2, self.language.id: 2})
+
+    def test_update_adds_the_values_of_a_moved_course(self):
+        self.index.ensure_current()
+        course = self.courses[3]
+
+        self.index.update(
+            course.pk,
+            (self.dharma.id, self.dharma_center.id, self.philosophy.id),
+            (self.sherab.id, None, self.philosophy.id),
+        )
+
+        facets = self.index.get_facets(self.sherab.id)
+        self.assertEqual(facets["count"], 4)
+        self.assertEqual(facets["categories"], {self.philosophy.id: 2, self.language.id: 2})
+        self.assertEqual(self.index.get_facets(self.dharma.id)["count"], 0)
@@ -0,0 +1,122 @@
+"""
+Tests for the deferred processing of course publish and delete events
+"""
+
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from opaque_keys.edx.keys import CourseKey
+
+from course_partnerships.publishing import CourseEventBatch, LocalQueueWorker, record_course_event
+
+COURSE_A = CourseKey.from_string("course-v1:edX+A+2024")
+COURSE_B = CourseKey.from_string("course-v1:edX+B+2024")
+COURSE_C = CourseKey.from_string("course-v1:edX+C+2024")
+
+
+class CourseEventBatchTest(TestCase):
+    """
+    Tests for CourseEventBatch.
+    """
+
+    def test_latest_event_wins(self):
+        batch = CourseEventBatch()
+        batch.add(COURSE_A)
+        batch.add(COURSE_A, deleted=True)
+        batch.add(COURSE_B, deleted=True)
+        batch.add(COURSE_B)
+
+        self.assertEqual(batch.published, {COURSE_B})
+        self.assertEqual(batch.deleted, {COURSE_A})
+
+    def test_merge(self):
+        batch = CourseEventBatch(published=[COURSE_A], deleted=[COURSE_B])
+        batch.merge(CourseEventBatch(published=[COURSE_B], deleted=[COURSE_C]))
+
+        self.assertEqual(batch.published, {COURSE_A, COURSE_B})
+        self.assertEqual(batch.deleted, {COURSE_C})
+
+    def test_empty_batch_is_false(self):
+        self.assertFalse(CourseEventBatch())
+        self.assertTrue(CourseEventBatch(deleted=[COURSE_A]))
+
+
+@override_settings(COURSE_PARTNERSHIPS_PUBLISH_BACKEND="inline")
+@mock.patch("course_partnerships.publishing.process_course_events")
+class RecordCourseEventTest(TestCase):
+    """
+    Tests for the recording and dispatch of course events on commit.
+    """
+
+    def test_events_of_a_transaction_are_dispatched_once(self, process_course_events):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_course_event(COURSE_A)
+            record_course_event(COURSE_A)
+            record_course_event(COURSE_B)
+            record_course_event(COURSE_B, deleted=True)
+
+        process_course_events.assert_called_once_with({COURSE_A}, {COURSE_B})
+
+    def test_nothing_is_dispatched_before_commit(self, process_course_events):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            record_course_event(COURSE_A)
+
+        process_course_events.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+
+    def test_rolled_back_events_are_dropped(self, process_course_events):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    record_course_event(COURSE_A, deleted=True)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            record_course_event(COURSE_B)
+
+        process_course_events.assert_called_once_with({COURSE_B}, set())
+
+    def test_events_recorded_after_a_rollback_start_a_new_batch(self, process_course_events):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                record_course_event(COURSE_A)
+            try:
+                with transaction.atomic():
+                    record_course_event(COURSE_B, deleted=True)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        process_course_events.assert_called_once_with({COURSE_A}, set())
+
+    @override_settings(COURSE_PARTNERSHIPS_PUBLISH_BACKEND="celery")
+    def test_celery_backend(self, process_course_events):
+        with mock.patch("course_partnerships.tasks.process_course_events_task") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                record_course_event(COURSE_A)
+                record_course_event(COURSE_B, deleted=True)
+
+        task.delay.assert_called_once_with([str(COURSE_A)], [str(COURSE_B)])
+        process_course_events.assert_not_called()
+
+
+@mock.patch("course_partnerships.publishing.process_course_events")
+class LocalQueueWorkerTest(TestCase):
+    """
+    Tests for the in-process queue worker.
+    """
+
+    def test_drain_coalesces_queued_batches(self, process_course_events):
+        worker = LocalQueueWorker(start_thread=False)
+        worker.submit(CourseEventBatch(published=[COURSE_A, COURSE_B]))
+        worker.submit(CourseEventBatch(published=[COURSE_C], deleted=[COURSE_A]))
+
+        worker.drain()
+
+        process_course_events.assert_called_once_with({COURSE_B, COURSE_C}, {COURSE_A})
+
+    def test_drain_without_batches(self, process_course_events):
+        LocalQueueWorker(start_thread=False).drain()
+
+        process_course_events.assert_not_called()
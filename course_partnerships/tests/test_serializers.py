@@ -0,0 +1,46 @@
+"""
+Tests for the course_partnerships serializers
+"""
+
+from django.test import RequestFactory, TestCase
+from organizations.models import Organization
+
+from course_partnerships.models import Partner, PartnerOrganizationMapping
+from course_partnerships.serializers import PartnerOrganizationMappingSerializer, serialize_partner_mappings
+
+
+class SerializePartnerMappingsTest(TestCase):
+    """
+    Tests that the values_list fast path matches PartnerOrganizationMappingSerializer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.request = RequestFactory().get("/api/partners/", HTTP_HOST="testserver")
+        sherab = Partner.objects.create(name="Sherab", slug="sherab", logo="partner/sherab.png")
+        dharma = Partner.objects.create(name="Dharma School", slug="dharma", logo="")
+        organizations = [
+            Organization.objects.create(name=name, short_name=name) for name in ("SherabX", "SherabY", "DharmaX")
+        ]
+        PartnerOrganizationMapping.objects.create(partner=sherab, organization=organizations[0])
+        PartnerOrganizationMapping.objects.create(
+            partner=sherab, organization=organizations[1], display_name="Sherab Ling"
+        )
+        PartnerOrganizationMapping.objects.create(partner=dharma, organization=organizations[2])
+
+    def assertSameOutput(self, mappings):
+        serializer = PartnerOrganizationMappingSerializer(mappings, many=True, context={"request": self.request})
+        expected = [dict(item) for item in serializer.data]
+        self.assertEqual(serialize_partner_mappings(mappings, self.request), expected)
+        return expected
+
+    def test_output_matches_serializer(self):
+        data = self.assertSameOutput(PartnerOrganizationMapping.objects.order_by("id"))
+
+        self.assertEqual([item["partner_name"] for item in data], ["Sherab", "Sherab Ling", "Dharma School"])
+        self.assertTrue(data[0]["logo"].startswith("http://testserver/"))
+        self.assertTrue(data[0]["logo"].endswith("partner/sherab.png"))
+        self.assertIsNone(data[2]["logo"])
+
+    def test_output_matches_serializer_without_rows(self):
+        self.assertEqual(self.assertSameOutput(PartnerOrganizationMapping.objects.none()), [])
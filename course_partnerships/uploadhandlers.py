@@ -0,0 +1,65 @@
+"""
+Upload handler enforcing the image upload limits while the request is read
+"""
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .validators import (
+    IMAGE_UPLOAD_LIMITS,
+    MAX_IMAGE_HEADER_BYTES,
+    check_image_header,
+    check_image_size,
+    parse_image_header,
+)
+
+
+class ImageUploadLimitHandler(FileUploadHandler):
+    """
+    Skip image uploads breaking their limits as soon as the offending bytes arrive.
+
+    The kind of limit is picked from the form field name (logo, banner or
+    profile_picture). The size is checked on every chunk and the format and
+    pixel dimensions as soon as the file header has been received, so an
+    oversized file is dropped before the rest of it is buffered. Rejections are
+    kept in `request.rejected_uploads`, by field name, so that the form can
+    report them.
+
+    It must be installed before request.POST or request.FILES is accessed.
+    """
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.kind = field_name if field_name in IMAGE_UPLOAD_LIMITS else None
+        self.received = 0
+        self.header = b""
+        self.header_checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.kind:
+            self.received += len(raw_data)
+            try:
+                check_image_size(self.kind, self.received)
+                if not self.header_checked:
+                    self.check_header(raw_data)
+            except ValidationError as e:
+                self.request.rejected_uploads = getattr(self.request, "rejected_uploads", {})
+                self.request.rejected_uploads[self.field_name] = e.messages
+                raise SkipFile()
+        return raw_data
+
+    def check_header(self, raw_data):
+        self.header += raw_data[: MAX_IMAGE_HEADER_BYTES - len(self.header)]
+        try:
+            header = parse_image_header(self.header)
+        except ValueError:
+            raise ValidationError("Upload a valid image.")
+        if header is None and len(self.header) >= MAX_IMAGE_HEADER_BYTES:
+            raise ValidationError("Upload a valid image.")
+        if header:
+            self.header_checked = True
+            self.header = b""
+            check_image_header(self.kind, self.file_name, header)
+
+    def file_complete(self, file_size):
+        return None
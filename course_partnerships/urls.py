@@ -15,6 +15,18 @@ urlpatterns = [
     path("schools/<slug:slug>/", PartnerDetailView.as_view(), name="partner-detail"),
     path("schools/<slug:partner_slug>/<slug:center_slug>/", CenterDetailView.as_view(), name="center-detail"),
 
+    # Pages of the courses of a partner, loaded lazily by the partner and center pages
+    path("api/schools/<slug:slug>/courses/", PartnerCourseListAPIView.as_view(), name="partner-course-list"),
+
     # Endpoint to retrieve all partners with their names and logo URLs
     path("api/partners/", PartnerListAPIView.as_view(), name="partner-list"),
+
+    # Categories shown on the homepage with their courses
+    path("api/homepage/", HomepageCatalogAPIView.as_view(), name="homepage-catalog"),
+
+    # Faceted search over the course catalog
+    path("api/catalog/", CatalogAPIView.as_view(), name="catalog"),
+
+    # Ranked search over schools, centers, course creators and categories
+    path("api/search/", SearchAPIView.as_view(), name="search"),
 ]
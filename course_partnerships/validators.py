@@ -1,6 +1,9 @@
 import os
+import struct
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils.deconstruct import deconstructible
 
 
 def validate_bannner_extension(value):
@@ -21,3 +24,155 @@ def validate_video_extension(value):
     valid_extensions = [".mp4"]
     if not ext.lower() in valid_extensions:
         raise ValidationError("Unsupported file extension.")
+
+
+# Default upload limits per kind of image field; COURSE_PARTNERSHIPS_IMAGE_UPLOAD_LIMITS
+# overrides them, kind by kind.
+IMAGE_UPLOAD_LIMITS = {
+    "logo": {"max_bytes": 2 * 1024 * 1024, "max_pixels": 4096 * 4096},
+    "banner": {"max_bytes": 5 * 1024 * 1024, "max_pixels": 8192 * 8192},
+    "profile_picture": {"max_bytes": 2 * 1024 * 1024, "max_pixels": 4096 * 4096},
+}
+IMAGE_EXTENSION_FORMATS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+MAX_IMAGE_HEADER_BYTES = 256 * 1024
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
+
+
+def get_image_upload_limits(kind):
+    """
+    Return the {"max_bytes", "max_pixels"} limits of a kind of image field.
+    """
+    limits = dict(IMAGE_UPLOAD_LIMITS[kind])
+    limits.update(getattr(settings, "COURSE_PARTNERSHIPS_IMAGE_UPLOAD_LIMITS", {}).get(kind, {}))
+    return limits
+
+
+def parse_image_header(data):
+    """
+    Return (format, width, height) read from the first bytes of an image file.
+
+    Returns None when more bytes are needed, and raises ValueError when the
+    data is not a PNG, JPEG, GIF or WebP file. Nothing is decoded.
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) < 24:
+            return None
+        if data[12:16] != b"IHDR":
+            raise ValueError("Invalid PNG header")
+        width, height = struct.unpack(">II", data[16:24])
+        return "PNG", width, height
+
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        if len(data) < 10:
+            return None
+        width, height = struct.unpack("<HH", data[6:10])
+        return "GIF", width, height
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        if len(data) < 30:
+            return None
+        chunk = data[12:16]
+        if chunk == b"VP8X":
+            return "WEBP", int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return "WEBP", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", data[26:30])
+            return "WEBP", width & 0x3FFF, height & 0x3FFF
+        raise ValueError("Invalid WebP header")
+
+    if data[:2] == b"\xff\xd8":
+        position = 2
+        while True:
+            while position < len(data) and data[position] == 0xFF and data[position + 1 : position + 2] == b"\xff":
+                position += 1
+            if position + 4 > len(data):
+                return None
+            if data[position] != 0xFF:
+                raise ValueError("Invalid JPEG marker")
+            marker = data[position + 1]
+            if marker in _JPEG_STANDALONE_MARKERS:
+                position += 2
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                if position + 9 > len(data):
+                    return None
+                height, width = struct.unpack(">HH", data[position + 5 : position + 9])
+                return "JPEG", width, height
+            if marker == 0xD9:
+                raise ValueError("JPEG without frame header")
+            (length,) = struct.unpack(">H", data[position + 2 : position + 4])
+            position += 2 + length
+
+    raise ValueError("Unknown image format")
+
+
+def read_image_header(file):
+    """
+    Return (format, width, height) of an image file, reading only as many bytes as needed.
+    """
+    file.seek(0)
+    data = b""
+    try:
+        while len(data) < MAX_IMAGE_HEADER_BYTES:
+            chunk = file.read(16 * 1024)
+            if not chunk:
+                break
+            data += chunk
+            header = parse_image_header(data)
+            if header:
+                return header
+    finally:
+        file.seek(0)
+    raise ValueError("Truncated image header")
+
+
+def check_image_header(kind, name, header):
+    """
+    Raise ValidationError if a parsed image header breaks the limits of its kind of field.
+    """
+    fmt, width, height = header
+    expected_format = IMAGE_EXTENSION_FORMATS.get(os.path.splitext(name)[1].lower())
+    if fmt != expected_format:
+        raise ValidationError("The file content does not match its extension.")
+    max_pixels = get_image_upload_limits(kind)["max_pixels"]
+    if width * height > max_pixels:
+        raise ValidationError(f"Image dimensions {width}x{height} exceed the limit of {max_pixels} pixels.")
+
+
+def check_image_size(kind, size):
+    """
+    Raise ValidationError if a file is larger than allowed for its kind of field.
+    """
+    max_bytes = get_image_upload_limits(kind)["max_bytes"]
+    if size is not None and size > max_bytes:
+        raise ValidationError(f"File size exceeds the limit of {max_bytes // 1024} KB.")
+
+
+@deconstructible
+class ImageUploadValidator:
+    """
+    Validate a newly uploaded image from its size and file header.
+
+    The real format and pixel dimensions are read from the first bytes of the
+    file, so oversized or mislabelled images are rejected without decoding
+    them. Files already in storage are not checked again.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def __call__(self, value):
+        if getattr(value, "_committed", False):
+            return
+        check_image_size(self.kind, value.size)
+        try:
+            header = read_image_header(value)
+        except ValueError:
+            raise ValidationError("Upload a valid image.")
+        check_image_header(self.kind, value.name, header)
+
+    def __eq__(self, other):
+        return isinstance(other, ImageUploadValidator) and self.kind == other.kind
@@ -1,18 +1,30 @@
 import logging
 
 from common.djangoapps.edxmako.shortcuts import render_to_response
-from django.db.models import Count
+from django.core.cache import cache
 from django.http import Http404
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from django.utils.http import urlencode
 from django.views.generic import View
-from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .cache import get_page_cache_timeout, get_partner_page_key
+from .catalog import CatalogQuery
 from .models import *
-from .serializers import PartnerOrganizationMappingSerializer
+from .pagination import InvalidCursor, get_page_size
+from .search import MIN_QUERY_LENGTH, SEARCH_MODELS, get_search_results, search
+from .serializers import serialize_course_cards
+from .slugs import slug_cache
+from .snapshots import homepage_catalog, partner_directory
 
 log = logging.getLogger(__name__)
 
+COURSE_PAGE_SIZE = 24
+SEARCH_PAGE_SIZE = 20
+
 
 class PartnerDetailView(View):
     """
@@ -21,29 +33,39 @@ class PartnerDetailView(View):
 
     def get(self, request, slug):
         try:
-            partner = Partner.objects.get(slug=slug)
-        except Exception as e:
+            partner_id, _ = slug_cache.get_partner(slug)
+        except Partner.DoesNotExist:
             raise Http404
 
+        page_key = get_partner_page_key(partner_id)
+        context = cache.get(page_key)
+        if context is None:
+            try:
+                partner = Partner.objects.get(pk=partner_id)
+            except Partner.DoesNotExist:
+                raise Http404
+
+            context = self.get_context(partner)
+            cache.set(page_key, context, get_page_cache_timeout())
+        return render_to_response("course_partnerships/partner-details.html", context)
+
+    def get_context(self, partner):
+        """
+        Build the page context, evaluating every queryset so that it can be cached.
+        """
         centers = Center.objects.filter(partner=partner)
-        category_ids = CourseOverview.objects.filter(enhancedcourse__partner=partner).values_list(
-            "enhancedcourse__category", flat=True
-        )
-        categories = (
-            Category.objects.filter(id__in=category_ids)
-            .annotate(num_courses=Count("enhancedcourse"))
-            .filter(num_courses__gt=0)
-        )
-        partner_courses = CourseOverview.objects.filter(enhancedcourse__partner=partner)
+        categories = PartnerCategoryCount.get_categories(partner)
+        partner_courses, next_cursor = EnhancedCourse.get_page(partner, page_size=COURSE_PAGE_SIZE)
         course_creators = CourseCreator.objects.filter(partner=partner)
-        context = {
+        return {
             "partner": partner,
-            "centers": centers,
-            "categories": categories,
-            "partner_courses": partner_courses,
-            "course_creators": course_creators,
+            "centers": list(centers),
+            "categories": list(categories),
+            "partner_courses": [enhanced_course.as_course_overview() for enhanced_course in partner_courses],
+            "partner_courses_next_cursor": next_cursor,
+            "partner_courses_url": reverse("course_partnerships:partner-course-list", args=[partner.slug]),
+            "course_creators": list(course_creators),
         }
-        return render_to_response("course_partnerships/partner-details.html", context)
 
 
 class CenterDetailView(View):
@@ -53,24 +75,26 @@ class CenterDetailView(View):
 
     def get(self, request, partner_slug, center_slug):
         try:
-            partner = Partner.objects.get(slug=partner_slug)
-        except Exception as e:
-            raise Http404
-
-        try:
-            center = Center.objects.get(partner=partner, slug=center_slug)
-        except Exception as e:
+            partner_id, _ = slug_cache.get_partner(partner_slug)
+            center_id, _ = slug_cache.get_center(partner_id, center_slug)
+            center = Center.objects.select_related("partner").get(pk=center_id)
+        except (Partner.DoesNotExist, Center.DoesNotExist):
             raise Http404
+        partner = center.partner
 
-        category_ids = CourseOverview.objects.filter(enhancedcourse__partner=partner).values_list(
-            "enhancedcourse__category", flat=True
-        )
-        categories = (
-            Category.objects.filter(id__in=category_ids)
-            .annotate(num_courses=Count("enhancedcourse"))
-            .filter(num_courses__gt=0)
-        )
-        context = {"partner": partner, "center": center, "categories": categories}
+        categories = PartnerCategoryCount.get_categories(partner)
+        center_courses, next_cursor = EnhancedCourse.get_page(partner, center=center, page_size=COURSE_PAGE_SIZE)
+        context = {
+            "partner": partner,
+            "center": center,
+            "categories": categories,
+            "center_courses": [enhanced_course.as_course_overview() for enhanced_course in center_courses],
+            "center_courses_next_cursor": next_cursor,
+            "center_courses_url": "{}?{}".format(
+                reverse("course_partnerships:partner-course-list", args=[partner.slug]),
+                urlencode({"center": center.slug}),
+            ),
+        }
         return render_to_response("course_partnerships/center-details.html", context)
 
 
@@ -84,6 +108,9 @@ class PartnerListAPIView(APIView):
 
     Only mappings marked with `show_in_mobile_app=True` are returned.
 
+    The payload is a precomputed snapshot, rebuilt when a mapping, partner or
+    organization changes, and served with `ETag` and `Last-Modified` headers.
+
     Method:
         GET
 
@@ -109,8 +136,336 @@ class PartnerListAPIView(APIView):
             request (HttpRequest): The incoming HTTP request.
 
         Returns:
-            Response: A list of serialized mappings.
+            Response: A list of serialized mappings, or a 304 if the client's
+            If-None-Match/If-Modified-Since validators are still current.
+        """
+        return partner_directory.response(request)
+
+
+class HomepageCatalogAPIView(APIView):
+    """
+    API endpoint to retrieve the course rails of the homepage.
+
+    Returns the categories flagged with `show_on_homepage`, each with its most
+    recent courses, and the partners of those courses with their logos. The
+    payload is a precomputed snapshot, rebuilt when a category, course or
+    partner changes, and served with `ETag` and `Last-Modified` headers.
+
+    Method:
+        GET
+
+    Example Response (200 OK):
+        {
+            "categories": [
+                {
+                    "id": 5,
+                    "name": "Category",
+                    "courses": [
+                        {"id": "course-v1:org+course+run", "display_name": "Course Name", "partner": 1, ...},
+                        ...
+                    ]
+                },
+                ...
+            ],
+            "partners": [
+                {
+                    "id": 1,
+                    "name": "Partner Name",
+                    "slug": "partner-slug",
+                    "logo": "https://yourdomain.com/../partner_logo.png",
+                    "logo_derivatives": [...]
+                },
+                ...
+            ]
+        }
+    """
+
+    # This API is intended for public access, so no authentication is required.
+    authentication_classes = []
+
+    def get(self, request):
+        """
+        Handles GET requests to retrieve the homepage course rails.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            Response: The homepage categories, courses and partners, or a 304
+            if the client's If-None-Match/If-Modified-Since validators are still current.
+        """
+        return homepage_catalog.response(request)
+
+
+class PartnerCourseListAPIView(APIView):
+    """
+    API endpoint to page through the courses of a partner.
+
+    The partner and center pages render the first page of courses and load
+    the following ones lazily from this endpoint.
+
+    Method:
+        GET
+
+    Query parameters:
+        center (str): Optional slug of a center of the partner
+        category (int): Optional category id
+        cursor (str): `next_cursor` of the previous page
+        page_size (int): Number of courses per page (default 24, at most 100)
+
+    Example Response (200 OK):
+        {
+            "results": [
+                {
+                    "id": "course-v1:org+course+run",
+                    "display_name": "Course Name",
+                    "course_image_url": "/asset-v1:org+course+run+type@asset+block@image.jpg",
+                    "start": "2025-01-01T00:00:00Z",
+                    ...
+                },
+                ...
+            ],
+            "next_cursor": "WzQyXQ=="
+        }
+    """
+
+    # This API is intended for public access, so no authentication is required.
+    authentication_classes = []
+
+    def get(self, request, slug):
+        """
+        Handles GET requests to retrieve one page of the partner's courses.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+            slug (str): The partner slug.
+
+        Returns:
+            Response: The page of courses and the cursor of the next page.
         """
-        mappings = PartnerOrganizationMapping.objects.filter(show_in_mobile_app=True)
-        serializer = PartnerOrganizationMappingSerializer(mappings, many=True, context={"request": request})
-        return Response(serializer.data)
+        try:
+            partner_id, _ = slug_cache.get_partner(slug)
+        except Partner.DoesNotExist:
+            raise Http404
+
+        center_id = None
+        if request.query_params.get("center"):
+            try:
+                center_id, _ = slug_cache.get_center(partner_id, request.query_params["center"])
+            except Center.DoesNotExist:
+                return Response({"error": "Unknown center"}, status=status.HTTP_400_BAD_REQUEST)
+
+        category = None
+        if request.query_params.get("category"):
+            try:
+                category = Category.objects.get(id=request.query_params["category"])
+            except (Category.DoesNotExist, ValueError):
+                return Response({"error": "Unknown category"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            courses, next_cursor = EnhancedCourse.get_page(
+                partner_id,
+                center=center_id,
+                category=category,
+                cursor=request.query_params.get("cursor"),
+                page_size=get_page_size(request.query_params.get("page_size"), default=COURSE_PAGE_SIZE),
+                as_values=True,
+            )
+        except InvalidCursor:
+            return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"results": serialize_course_cards(courses), "next_cursor": next_cursor})
+
+
+class CatalogAPIView(APIView):
+    """
+    API endpoint to search the course catalog with facets.
+
+    Returns one page of the matching courses together with the number of
+    matching courses per center and per category. Facet counts ignore the
+    selection of their own facet, so selecting another center or category
+    adds exactly the number of courses shown next to it.
+
+    Method:
+        GET
+
+    Query parameters:
+        partner (str): Optional partner slug
+        center (str): Center slug of the partner, can be repeated
+        category (int): Category id, can be repeated
+        start_after (datetime): Only courses starting at or after this ISO 8601 date
+        start_before (datetime): Only courses starting before this ISO 8601 date
+        language (str): Only courses in this language
+        cursor (str): `next_cursor` of the previous page
+        page_size (int): Number of courses per page (default 24, at most 100)
+
+    Example Response (200 OK):
+        {
+            "results": [{"id": "course-v1:org+course+run", "display_name": "Course Name", ...}, ...],
+            "next_cursor": "WzQyXQ==",
+            "count": 57,
+            "facets": {
+                "centers": [{"id": 3, "slug": "center", "name": "Center", "count": 12}, ...],
+                "categories": [{"id": 5, "name": "Category", "count": 30}, ...]
+            }
+        }
+    """
+
+    # This API is intended for public access, so no authentication is required.
+    authentication_classes = []
+
+    def get(self, request):
+        """
+        Handles GET requests to retrieve one page of the catalog and its facet counts.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            Response: The page of courses, the cursor of the next page and the facet counts.
+        """
+        params = request.query_params
+        partner_id = None
+        if params.get("partner"):
+            try:
+                partner_id, _ = slug_cache.get_partner(params["partner"])
+            except Partner.DoesNotExist:
+                return Response({"error": "Unknown partner"}, status=status.HTTP_400_BAD_REQUEST)
+
+        center_ids = []
+        if params.getlist("center"):
+            if partner_id is None:
+                return Response({"error": "Filtering by center needs a partner"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                center_ids = [slug_cache.get_center(partner_id, slug)[0] for slug in set(params.getlist("center"))]
+            except Center.DoesNotExist:
+                return Response({"error": "Unknown center"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            category_ids = [int(category_id) for category_id in params.getlist("category")]
+        except ValueError:
+            return Response({"error": "Unknown category"}, status=status.HTTP_400_BAD_REQUEST)
+
+        dates = {}
+        for name in ("start_after", "start_before"):
+            if params.get(name):
+                try:
+                    dates[name] = parse_datetime(params[name])
+                except ValueError:
+                    dates[name] = None
+                if dates[name] is None:
+                    return Response({"error": f"Invalid {name}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        query = CatalogQuery(
+            partner_id=partner_id,
+            center_ids=center_ids,
+            category_ids=category_ids,
+            language=params.get("language"),
+            **dates,
+        )
+        try:
+            courses, next_cursor = query.get_page(
+                cursor=params.get("cursor"),
+                page_size=get_page_size(params.get("page_size"), default=COURSE_PAGE_SIZE),
+            )
+        except InvalidCursor:
+            return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        facets = query.get_facets()
+        return Response(
+            {
+                "results": serialize_course_cards(courses),
+                "next_cursor": next_cursor,
+                "count": facets["count"],
+                "facets": self.get_facet_data(facets),
+            }
+        )
+
+    def get_facet_data(self, facets):
+        """
+        Return the facet counts with the names of their centers and categories.
+        """
+        centers = Center.objects.filter(id__in=facets["centers"]).order_by("name").values("id", "slug", "name")
+        categories = Category.objects.filter(id__in=facets["categories"]).order_by("name").values("id", "name")
+        return {
+            "centers": [dict(center, count=facets["centers"][center["id"]]) for center in centers],
+            "categories": [dict(category, count=facets["categories"][category["id"]]) for category in categories],
+        }
+
+
+class SearchAPIView(APIView):
+    """
+    API endpoint to search schools, centers, course creators and categories.
+
+    Every word of the query must match; the last one may be the beginning of
+    a word, so the endpoint can serve autocompletion. Results are ranked by
+    relevance, names weighing more than titles and descriptions.
+
+    Method:
+        GET
+
+    Query parameters:
+        q (str): The search query, of at least 2 characters
+        type (str): Only return this kind of result, among partner, center,
+            course_creator and category. Can be repeated.
+        page (int): Page number, starting at 1
+        page_size (int): Number of results per page (default 20, at most 100)
+
+    Example Response (200 OK):
+        {
+            "count": 42,
+            "next_page": 2,
+            "results": [
+                {
+                    "type": "partner",
+                    "id": 1,
+                    "score": 20,
+                    "name": "School Name",
+                    "description": "First words of the school description…",
+                    "url": "/schools/school-slug/"
+                },
+                ...
+            ]
+        }
+    """
+
+    # This API is intended for public access, so no authentication is required.
+    authentication_classes = []
+
+    def get(self, request):
+        """
+        Handles GET requests to retrieve one page of ranked search results.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            Response: The total number of results, the next page number and the page of results.
+        """
+        params = request.query_params
+        query = params.get("q", "").strip()
+        if not query:
+            return Response({"error": "Missing query"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(query) < MIN_QUERY_LENGTH:
+            return Response({"error": "Query too short"}, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = params.getlist("type")
+        if any(kind not in SEARCH_MODELS for kind in kinds):
+            return Response({"error": "Unknown type"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = max(1, int(params.get("page", 1)))
+        except ValueError:
+            return Response({"error": "Invalid page"}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = get_page_size(params.get("page_size"), default=SEARCH_PAGE_SIZE)
+
+        ranked = search(query, kinds=kinds)
+        start = (page - 1) * page_size
+        count = ranked.count()
+        return Response(
+            {
+                "count": count,
+                "next_page": page + 1 if start + page_size < count else None,
+                "results": get_search_results(list(ranked[start : start + page_size])),
+            }
+        )
@@ -88,6 +88,8 @@ setup(
         "cms.djangoapp": [
             "course_partnerships = course_partnerships.apps:CoursePartnershipsConfig",
             "user_extension = user_extension.apps:UserExtensionConfig",
+            # Studio sends course_deleted, whose receiver removes the wishlist rows of the course.
+            "wishlist = wishlist.apps:WishlistConfig",
         ],
     },
 )
@@ -0,0 +1,60 @@
+"""
+Cache helpers for wishlist
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+
+WISHLIST_CACHE_TIMEOUT = 60 * 60
+WISHLIST_COURSE_IDS_KEY = "wishlist.user.{user_id}.course_ids"
+
+
+def get_wishlist_cache_timeout():
+    """
+    Return the lifetime, in seconds, of cached wishlist data.
+    """
+    return getattr(settings, "WISHLIST_CACHE_TIMEOUT", WISHLIST_CACHE_TIMEOUT)
+
+
+def get_cached_course_ids(user_id):
+    """
+    Return the cached set of course ids wishlisted by a user, or None.
+    """
+    return cache.get(WISHLIST_COURSE_IDS_KEY.format(user_id=user_id))
+
+
+def set_cached_course_ids(user_id, course_ids):
+    cache.set(WISHLIST_COURSE_IDS_KEY.format(user_id=user_id), frozenset(course_ids), get_wishlist_cache_timeout())
+
+
+def invalidate_cached_course_ids(user_id):
+    cache.delete(WISHLIST_COURSE_IDS_KEY.format(user_id=user_id))
+
+
+COURSE_DISPLAY_NAME_KEY = "wishlist.course.{course_id}.display_name"
+
+
+def get_course_display_names(course_keys):
+    """
+    Return {course_id: display_name} for the given courses that exist.
+
+    Found courses are cached per course so that wishlist writes do not need to
+    load the course overview. Missing courses are not cached, so that a course
+    published right after a lookup can be wishlisted at once.
+    """
+    keys = {COURSE_DISPLAY_NAME_KEY.format(course_id=course_key): course_key for course_key in course_keys}
+    cached = cache.get_many(list(keys))
+
+    missing = [course_key for key, course_key in keys.items() if key not in cached]
+    if missing:
+        found = dict(CourseOverview.objects.filter(id__in=missing).values_list("id", "display_name"))
+        fetched = {
+            COURSE_DISPLAY_NAME_KEY.format(course_id=course_key): found[course_key]
+            for course_key in missing
+            if course_key in found
+        }
+        cache.set_many(fetched, get_wishlist_cache_timeout())
+        cached.update(fetched)
+
+    return {str(keys[key]): display_name for key, display_name in cached.items()}
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from wishlist.models import Wishlist, WishlistCounter
+
+
+class Command(BaseCommand):
+    """
+    Command to recompute the per-course wishlist counters from the Wishlist table.
+
+    Only counters that drifted are written.
+
+    Example usage:
+        ./manage.py repair_wishlist_counters
+        ./manage.py repair_wishlist_counters --dry-run
+    """
+    help = "Recompute the per-course wishlist counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of counters written per statement (default: 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted counters without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        actual = {
+            str(row["course_id"]): (row["course_id"], row["wishlist_count"])
+            for row in Wishlist.objects.values("course_id").annotate(wishlist_count=Count("id")).order_by()
+        }
+        stored = {str(counter.course_id): counter for counter in WishlistCounter.objects.all()}
+
+        to_create = [
+            WishlistCounter(course_id=course_key, wishlist_count=count)
+            for course_id, (course_key, count) in actual.items()
+            if course_id not in stored
+        ]
+        to_update = []
+        for course_id, counter in stored.items():
+            count = actual.get(course_id, (None, 0))[1]
+            if counter.wishlist_count != count:
+                counter.wishlist_count = count
+                to_update.append(counter)
+
+        if not options["dry_run"]:
+            WishlistCounter.objects.bulk_create(to_create, batch_size=options["batch_size"], ignore_conflicts=True)
+            WishlistCounter.objects.bulk_update(to_update, ["wishlist_count"], batch_size=options["batch_size"])
+
+        verb = "Would fix" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(to_create)} missing and {len(to_update)} drifted counters"))
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.19 on 2026-10-18 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('course_overviews', '0027_auto_20221102_1109'),
+        ('wishlist', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wishlist',
+            index=models.Index(fields=['user', 'created', 'id'], name='wishlist_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.19 on 2026-10-18 11:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_overviews', '0027_auto_20221102_1109'),
+        ('wishlist', '0002_wishlist_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WishlistCounter',
+            fields=[
+                ('course', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='wishlist_counter', serialize=False, to='course_overviews.courseoverview')),
+                ('wishlist_count', models.PositiveIntegerField(db_index=True, default=0)),
+            ],
+            options={
+                'verbose_name': 'Wishlist Counter',
+                'verbose_name_plural': 'Wishlist Counters',
+            },
+        ),
+    ]
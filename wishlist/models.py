@@ -9,13 +9,18 @@ file and check it in at the same time as your model changes. To do that,
 3. ./manage.py lms migrate --settings=production
 """
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 
+from course_partnerships.models import EnhancedCourse
+from course_partnerships.pagination import DEFAULT_PAGE_SIZE, paginate_by_keyset
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
+from .cache import get_cached_course_ids, invalidate_cached_course_ids, set_cached_course_ids
+
 
 class Wishlist(TimeStampedModel):
     """
@@ -35,6 +40,7 @@ class Wishlist(TimeStampedModel):
 
     class Meta:
         unique_together = ("user", "course")
+        indexes = [models.Index(fields=["user", "created", "id"], name="wishlist_user_created_idx")]
         app_label = "wishlist"
         verbose_name = "Wishlist"
         verbose_name_plural = "Wishlists"
@@ -48,3 +54,167 @@ class Wishlist(TimeStampedModel):
             return cls.objects.get(user=user, course_id=course_id)
         except Exception as e:
             return None
+
+    @classmethod
+    def wishlisted_course_ids(cls, user, course_ids=None):
+        """
+        Return the set of course ids, as strings, wishlisted by a user.
+
+        The full set is cached per user, so checking a whole page of courses
+        costs one lookup at most. When course_ids is given, only those of them
+        that are wishlisted are returned.
+        """
+        if not user.is_authenticated:
+            return set()
+
+        wishlisted = get_cached_course_ids(user.id)
+        if wishlisted is None:
+            course_ids_query = cls.objects.filter(user=user).values_list("course_id", flat=True)
+            wishlisted = {str(course_id) for course_id in course_ids_query}
+            set_cached_course_ids(user.id, wishlisted)
+
+        if course_ids is None:
+            return set(wishlisted)
+        return {str(course_id) for course_id in course_ids} & wishlisted
+
+    @classmethod
+    def add_courses(cls, user, course_keys):
+        """
+        Add courses to a user's wishlist, ignoring those already there.
+
+        Each course is inserted in a savepoint, and the unique constraint on
+        (user, course) tells whether it was already wishlisted, so concurrent
+        requests adding the same course count it only once.
+
+        Returns the set of course ids, as strings, that were not wishlisted before.
+        """
+        new_course_keys = []
+        with transaction.atomic():
+            for course_key in course_keys:
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(user=user, course_id=course_key)
+                except IntegrityError:
+                    continue
+                new_course_keys.append(course_key)
+            if new_course_keys:
+                WishlistCounter.adjust(new_course_keys, 1)
+                cls._invalidate_cache(user)
+        return {str(course_key) for course_key in new_course_keys}
+
+    @classmethod
+    def remove_courses(cls, user, course_keys):
+        """
+        Remove courses from a user's wishlist, ignoring those not there.
+
+        Each course is deleted on its own, and only the courses whose row this
+        transaction deleted are counted, so concurrent requests removing the
+        same course count it only once.
+
+        Returns the set of course ids, as strings, that were wishlisted before.
+        """
+        removed_course_keys = []
+        with transaction.atomic():
+            for course_key in course_keys:
+                if cls.objects.filter(user=user, course_id=course_key).delete()[0]:
+                    removed_course_keys.append(course_key)
+            if removed_course_keys:
+                WishlistCounter.adjust(removed_course_keys, -1)
+                cls._invalidate_cache(user)
+        return {str(course_key) for course_key in removed_course_keys}
+
+    @staticmethod
+    def _invalidate_cache(user):
+        """
+        Drop the cached wishlist of a user now, for reads later in this transaction,
+        and again on commit, in case a concurrent request cached the old one meanwhile.
+        """
+        invalidate_cached_course_ids(user.id)
+        transaction.on_commit(lambda: invalidate_cached_course_ids(user.id))
+
+    @classmethod
+    def get_page(cls, user, cursor=None, page_size=DEFAULT_PAGE_SIZE, as_values=False):
+        """
+        Return one page of a user's wishlist, newest first, and the cursor of the next page.
+
+        Course cards are read from the fields copied into EnhancedCourse rather
+        than joined from CourseOverview. With as_values, items are flat
+        dictionaries with the card under "course" instead of model instances.
+        Items of courses that no longer exist are left out.
+        """
+        items = cls.objects.filter(user=user)
+        if as_values:
+            items = items.values("id", "created", "course_id")
+        else:
+            items = items.only("id", "created", "user_id", "course_id")
+        items, next_cursor = paginate_by_keyset(items, ("-created", "-id"), cursor=cursor, page_size=page_size)
+
+        course_ids = [item["course_id"] if as_values else item.course_id for item in items]
+        cards = EnhancedCourse.get_course_cards(course_ids, as_values=as_values)
+        page = []
+        for item, course_id in zip(items, course_ids):
+            card = cards.get(str(course_id))
+            if card is None:
+                continue
+            if as_values:
+                item["course"] = card
+            else:
+                item.course = card
+            page.append(item)
+        return page, next_cursor
+
+
+class WishlistCounter(models.Model):
+    """
+    Denormalized number of users who wishlisted a course.
+
+    Kept up to date incrementally by Wishlist.add_courses and
+    Wishlist.remove_courses. Changes made through other paths, such as the
+    Django admin or user retirement, are caught up by the
+    `repair_wishlist_counters` management command.
+    """
+
+    course = models.OneToOneField(
+        CourseOverview,
+        primary_key=True,
+        db_constraint=False,
+        on_delete=models.CASCADE,
+        related_name="wishlist_counter",
+    )
+    wishlist_count = models.PositiveIntegerField(default=0, db_index=True)
+
+    def __str__(self):
+        return f"{self.course_id}: {self.wishlist_count}"
+
+    class Meta:
+        app_label = "wishlist"
+        verbose_name = "Wishlist Counter"
+        verbose_name_plural = "Wishlist Counters"
+
+    @classmethod
+    def adjust(cls, course_keys, delta):
+        """
+        Add delta to the counters of the given courses.
+        """
+        if delta > 0:
+            cls.objects.bulk_create([cls(course_id=course_key) for course_key in course_keys], ignore_conflicts=True)
+        counters = cls.objects.filter(course_id__in=course_keys)
+        if delta < 0:
+            counters = counters.filter(wishlist_count__gte=-delta)
+        counters.update(wishlist_count=F("wishlist_count") + delta)
+
+    @classmethod
+    def most_wishlisted(cls, limit=10, partner=None, category=None):
+        """
+        Return the counters of the most wishlisted courses, optionally restricted
+        to the courses of a partner and/or a category.
+        """
+        counters = cls.objects.filter(wishlist_count__gt=0)
+        if partner is not None or category is not None:
+            courses = EnhancedCourse.objects.all()
+            if partner is not None:
+                courses = courses.filter(partner=partner)
+            if category is not None:
+                courses = courses.filter(category=category)
+            counters = counters.filter(course_id__in=courses.values("course_id"))
+        return counters.order_by("-wishlist_count", "course_id")[:limit]
@@ -8,5 +8,21 @@ from django.dispatch import receiver
 from django.db.models.signals import post_save
 from xmodule.modulestore.django import SignalHandler
 
+from ..cache import invalidate_cached_course_ids
+from ..models import Wishlist, WishlistCounter
 
 log = logging.getLogger(__name__)
+
+
+@receiver(SignalHandler.course_deleted)
+def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been deleted from Studio and
+    removes its wishlist entries and counter.
+    """
+    wishlist = Wishlist.objects.filter(course_id=course_key)
+    user_ids = list(wishlist.values_list("user_id", flat=True))
+    wishlist.delete()
+    WishlistCounter.objects.filter(course_id=course_key).delete()
+    for user_id in user_ids:
+        invalidate_cached_course_ids(user_id)
@@ -0,0 +1,69 @@
+"""
+Tests for the wishlist models
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from wishlist.models import Wishlist, WishlistCounter
+
+COURSE_A = CourseKey.from_string("course-v1:edX+A+2024")
+COURSE_B = CourseKey.from_string("course-v1:edX+B+2024")
+
+
+class WishlistCounterTest(TestCase):
+    """
+    Tests for the counters kept by Wishlist.add_courses and Wishlist.remove_courses.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.alice = User.objects.create_user("alice", "alice@example.com")
+        self.bob = User.objects.create_user("bob", "bob@example.com")
+
+    def assertCounts(self, expected):
+        counters = WishlistCounter.objects.values_list("course_id", "wishlist_count")
+        counts = {str(course_id): count for course_id, count in counters}
+        self.assertEqual(counts, {str(course_key): count for course_key, count in expected.items()})
+
+    def test_add_courses(self):
+        self.assertEqual(Wishlist.add_courses(self.alice, [COURSE_A, COURSE_B]), {str(COURSE_A), str(COURSE_B)})
+        self.assertEqual(Wishlist.add_courses(self.bob, [COURSE_A]), {str(COURSE_A)})
+
+        self.assertCounts({COURSE_A: 2, COURSE_B: 1})
+
+    def test_adding_a_wishlisted_course_again_is_not_counted(self):
+        Wishlist.add_courses(self.alice, [COURSE_A])
+
+        self.assertEqual(Wishlist.add_courses(self.alice, [COURSE_A, COURSE_B]), {str(COURSE_B)})
+        self.assertEqual(Wishlist.add_courses(self.alice, [COURSE_A]), set())
+
+        self.assertCounts({COURSE_A: 1, COURSE_B: 1})
+        self.assertEqual(Wishlist.objects.filter(user=self.alice).count(), 2)
+
+    def test_remove_courses(self):
+        Wishlist.add_courses(self.alice, [COURSE_A, COURSE_B])
+        Wishlist.add_courses(self.bob, [COURSE_A])
+
+        self.assertEqual(Wishlist.remove_courses(self.alice, [COURSE_A]), {str(COURSE_A)})
+
+        self.assertCounts({COURSE_A: 1, COURSE_B: 1})
+
+    def test_removing_a_course_twice_is_not_counted(self):
+        Wishlist.add_courses(self.alice, [COURSE_A])
+        Wishlist.add_courses(self.bob, [COURSE_A])
+
+        Wishlist.remove_courses(self.alice, [COURSE_A])
+        self.assertEqual(Wishlist.remove_courses(self.alice, [COURSE_A, COURSE_B]), set())
+
+        self.assertCounts({COURSE_A: 1})
+
+    def test_wishlisted_course_ids_follow_changes(self):
+        self.assertEqual(Wishlist.wishlisted_course_ids(self.alice), set())
+
+        Wishlist.add_courses(self.alice, [COURSE_A, COURSE_B])
+        self.assertEqual(Wishlist.wishlisted_course_ids(self.alice), {str(COURSE_A), str(COURSE_B)})
+
+        Wishlist.remove_courses(self.alice, [COURSE_B])
+        self.assertEqual(Wishlist.wishlisted_course_ids(self.alice), {str(COURSE_A)})
@@ -0,0 +1,33 @@
+"""
+Tests for the wishlist signal handlers
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import SignalHandler
+
+from wishlist.models import Wishlist, WishlistCounter
+
+COURSE_A = CourseKey.from_string("course-v1:edX+A+2024")
+COURSE_B = CourseKey.from_string("course-v1:edX+B+2024")
+
+
+class CourseDeletedTest(TestCase):
+    """
+    Tests for the removal of the wishlist rows of deleted courses.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("alice", "alice@example.com")
+        Wishlist.add_courses(self.user, [COURSE_A, COURSE_B])
+
+    def test_course_deleted_removes_wishlist_rows(self):
+        self.assertEqual(Wishlist.wishlisted_course_ids(self.user), {str(COURSE_A), str(COURSE_B)})
+
+        SignalHandler.course_deleted.send(sender=None, course_key=COURSE_A)
+
+        self.assertEqual(list(Wishlist.objects.values_list("course_id", flat=True)), [COURSE_B])
+        self.assertEqual(list(WishlistCounter.objects.values_list("course_id", flat=True)), [COURSE_B])
+        self.assertEqual(Wishlist.wishlisted_course_ids(self.user), {str(COURSE_B)})
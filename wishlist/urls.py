@@ -13,5 +13,9 @@ app_name = "wishlist"
 
 urlpatterns = [
     path("wishlist/change-status/", WishListChangeView.as_view(), name="change-wishlist-status"),
+    path("wishlist/batch/", WishListBatchView.as_view(), name="wishlist-batch"),
+    path("wishlist/items/", WishListItemsView.as_view(), name="wishlist-items"),
+    path("wishlist/most-wishlisted/", MostWishlistedView.as_view(), name="most-wishlisted"),
+    path("wishlist/status/", WishListStatusView.as_view(), name="wishlist-status"),
     path("wishlist/", wishlist_view, name="wishlist-view"),
 ]
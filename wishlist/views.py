@@ -10,11 +10,22 @@ from opaque_keys.edx.keys import CourseKey
 from common.djangoapps.util.db import outer_atomic
 from common.djangoapps.util.json_request import JsonResponse
 from common.djangoapps.edxmako.shortcuts import render_to_response
-from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
+from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
+from openedx.core.lib.api.authentication import BearerAuthenticationAllowInactiveUser
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from course_partnerships.models import COURSE_CARD_FIELDS, Category, Partner
+from course_partnerships.pagination import InvalidCursor, get_page_size
+from .cache import get_course_display_names
 from .models import *
 
 log = logging.getLogger(__name__)
 
+WISHLIST_PAGE_SIZE = 24
+
 
 class WishListChangeView(View):
     """
@@ -35,7 +46,7 @@ class WishListChangeView(View):
 
         try:
             course_key = CourseKey.from_string(request.POST.get("course_id"))
-            course = CourseOverview.get_from_id(course_key)
+            display_name = get_course_display_names([course_key])[str(course_key)]
         except Exception as e:
             log.warning(
                 "User %s tried to %s with invalid course id: %s",
@@ -46,26 +57,205 @@ class WishListChangeView(View):
             return HttpResponseBadRequest(_("Invalid course id"))
 
         if action == "add":
-            wishlist_item, created = Wishlist.objects.get_or_create(user=request.user, course=course)
-
-            if created:
-                response_msg = _("Course {} added to your wishlist.".format(course.display_name))
+            if Wishlist.add_courses(user, [course_key]):
+                response_msg = _("Course {} added to your wishlist.".format(display_name))
             else:
-                response_msg = _("Course {} is already in your wishlist.".format(course.display_name))
+                response_msg = _("Course {} is already in your wishlist.".format(display_name))
         elif action == "remove":
-            Wishlist.objects.filter(user=request.user, course=course).delete()
-            response_msg = _("Course {} removed from your wishlist.".format(course.display_name))
+            Wishlist.remove_courses(user, [course_key])
+            response_msg = _("Course {} removed from your wishlist.".format(display_name))
 
         return HttpResponse(response_msg)
 
 
+class WishListBatchView(APIView):
+    """
+    API endpoint applying many wishlist changes at once, e.g. to sync an offline wishlist.
+
+    All additions are applied with a single insert and all removals with a
+    single delete. Operations are applied in order, so the last operation on
+    a course wins.
+
+    Method:
+        POST
+
+    Example Request:
+        {
+            "operations": [
+                {"action": "add", "course_id": "course-v1:org+course+run"},
+                {"action": "remove", "course_id": "course-v1:org+other+run"}
+            ]
+        }
+
+    Example Response (200 OK):
+        {
+            "results": [
+                {"course_id": "course-v1:org+course+run", "action": "add", "status": "added"},
+                {"course_id": "course-v1:org+other+run", "action": "remove", "status": "not_wishlisted"}
+            ],
+            "wishlisted": ["course-v1:org+course+run"]
+        }
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (IsAuthenticated,)
+    max_operations = 500
+
+    def post(self, request):
+        operations = request.data.get("operations") if isinstance(request.data, dict) else None
+        if not isinstance(operations, list):
+            return Response({"error": _("A list of operations is required.")}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > self.max_operations:
+            return Response(
+                {"error": _("At most {} operations are allowed.").format(self.max_operations)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = []
+        actions = {}
+        for operation in operations:
+            operation = operation if isinstance(operation, dict) else {}
+            result = {"course_id": operation.get("course_id"), "action": operation.get("action")}
+            results.append(result)
+            try:
+                course_key = CourseKey.from_string(result["course_id"])
+            except Exception:  # pylint: disable=broad-exception-caught
+                result["status"] = "invalid"
+                continue
+            if result["action"] not in ("add", "remove"):
+                result["status"] = "invalid"
+                continue
+            result["course_id"] = str(course_key)
+            actions[course_key] = result["action"]
+
+        existing = get_course_display_names(actions)
+        added = Wishlist.add_courses(
+            request.user,
+            [course_key for course_key, action in actions.items() if action == "add" and str(course_key) in existing],
+        )
+        removed = Wishlist.remove_courses(
+            request.user,
+            [course_key for course_key, action in actions.items() if action == "remove"],
+        )
+
+        final_actions = {str(course_key): action for course_key, action in actions.items()}
+        for result in results:
+            if "status" in result:
+                continue
+            if final_actions[result["course_id"]] != result["action"]:
+                result["status"] = "superseded"
+            elif result["action"] == "add":
+                if result["course_id"] not in existing:
+                    result["status"] = "not_found"
+                else:
+                    result["status"] = "added" if result["course_id"] in added else "already_added"
+            else:
+                result["status"] = "removed" if result["course_id"] in removed else "not_wishlisted"
+
+        return Response({"results": results, "wishlisted": sorted(Wishlist.wishlisted_course_ids(request.user))})
+
+
+class WishListStatusView(View):
+    """
+    View returning which of the given courses are in the user's wishlist
+
+    Course ids are passed as repeated `course_id` query parameters. Without any,
+    every wishlisted course id is returned.
+    """
+
+    def get(self, request):
+        course_ids = request.GET.getlist("course_id") or None
+        wishlisted = Wishlist.wishlisted_course_ids(request.user, course_ids)
+        return JsonResponse({"wishlisted": sorted(wishlisted)})
+
+
+class MostWishlistedView(View):
+    """
+    View returning the most wishlisted courses as JSON
+
+    Optional query parameters:
+        partner: slug of a partner, to only rank its courses
+        category: id of a category, to only rank its courses
+        limit: number of courses to return (default 10, at most 50)
+    """
+
+    def get(self, request):
+        partner = None
+        if request.GET.get("partner"):
+            partner = Partner.objects.filter(slug=request.GET["partner"]).first()
+            if partner is None:
+                return HttpResponseBadRequest(_("Unknown partner"))
+
+        category = None
+        if request.GET.get("category"):
+            try:
+                category = Category.objects.get(id=request.GET["category"])
+            except (Category.DoesNotExist, ValueError):
+                return HttpResponseBadRequest(_("Unknown category"))
+
+        counters = WishlistCounter.most_wishlisted(
+            limit=get_page_size(request.GET.get("limit"), default=10, maximum=50),
+            partner=partner,
+            category=category,
+        )
+        results = [
+            {"course_id": str(course_id), "wishlist_count": wishlist_count}
+            for course_id, wishlist_count in counters.values_list("course_id", "wishlist_count")
+        ]
+        return JsonResponse({"results": results})
+
+
 @login_required
 def wishlist_view(request):
-    # Fetch all wishlisted courses for the logged-in user
-    wishlisted_courses = Wishlist.objects.filter(user=request.user).select_related("course")
+    # Fetch one page of wishlisted courses for the logged-in user
+    try:
+        wishlisted_courses, next_cursor = Wishlist.get_page(
+            request.user,
+            cursor=request.GET.get("cursor"),
+            page_size=get_page_size(request.GET.get("page_size"), default=WISHLIST_PAGE_SIZE),
+        )
+    except InvalidCursor:
+        return HttpResponseBadRequest(_("Invalid cursor"))
 
     context = {
         "wishlisted_courses": wishlisted_courses,
+        "next_cursor": next_cursor,
     }
 
     return render_to_response("wishlist/wishlist.html", context)
+
+
+class WishListItemsView(View):
+    """
+    JSON variant of the wishlist page
+
+    Returns one page of the user's wishlisted courses, newest first, with the
+    cursor to pass as `cursor` to get the next page.
+    """
+
+    def get(self, request):
+        if not request.user.is_authenticated:
+            return HttpResponseForbidden()
+
+        try:
+            items, next_cursor = Wishlist.get_page(
+                request.user,
+                cursor=request.GET.get("cursor"),
+                page_size=get_page_size(request.GET.get("page_size"), default=WISHLIST_PAGE_SIZE),
+                as_values=True,
+            )
+        except InvalidCursor:
+            return HttpResponseBadRequest(_("Invalid cursor"))
+
+        results = [
+            {
+                "created": item["created"],
+                "course": {field: item["course"][field] for field in ("id", *COURSE_CARD_FIELDS)},
+            }
+            for item in items
+        ]
+        return JsonResponse({"results": results, "next_cursor": next_cursor})